@@ -1,15 +1,500 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import os
 import plotly.graph_objects as go
+import atexit
+import glob
 import io
+import json
+import logging
+import math
+import queue
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import uuid
+from datetime import date, datetime, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Backend de armazenamento dos dados: "csv" (um CSV por conjunto), "parquet" ou "sqlite"
+STORAGE_BACKEND = os.environ.get("BEIRAMA_STORAGE", "csv")
+
+# Arquivo do banco de dados usado pelo backend SQLite
+DATABASE_PATH = os.environ.get("BEIRAMA_DATABASE", "beirama.db")
+
+# Pasta dos instantâneos Arrow (IPC) dos conjuntos de dados, compartilhados pelos
+# processos do servidor por mapeamento de memória
+SNAPSHOT_DIR = os.environ.get("BEIRAMA_SNAPSHOTS", "snapshots")
+
+# Intervalo (em segundos) entre as verificações de alterações feitas nos conjuntos de
+# dados por outras sessões ou por outros processos do servidor
+WATCH_INTERVAL = float(os.environ.get("BEIRAMA_WATCH_INTERVAL", "2"))
+
+# Fila de gravação dos formulários: quantidade máxima de envios aguardando na fila (quem
+# envia espera quando ela está cheia), de envios gravados juntos em uma escrita e tempo
+# máximo (em segundos) de espera para esvaziar a fila ao encerrar o servidor
+WRITE_QUEUE_SIZE = 1000
+WRITE_BATCH_SIZE = 500
+WRITE_FLUSH_TIMEOUT = 30
+
+# Quantidade máxima de gráficos guardados no cache de figuras
+FIGURE_CACHE_SIZE = 64
+
+# Quantidade máxima de pontos de cada série nos gráficos de linha e de área; acima
+# disso a série é reduzida (LTTB) mantendo o formato da curva
+CHART_POINT_BUDGET = int(os.environ.get("BEIRAMA_CHART_POINTS", "2000"))
+
+# Quantidade de pontos a partir da qual os gráficos de dispersão são desenhados com
+# WebGL (go.Scattergl) em vez de SVG
+SCATTER_GL_THRESHOLD = int(os.environ.get("BEIRAMA_SCATTER_GL", "1000"))
+
+# Quantidade máxima de arquivos de exportação (Excel/CSV) guardados em cache
+EXPORT_CACHE_SIZE = 8
+
+# Quantidade de linhas lidas por vez na importação de arquivos e quantidade máxima
+# de erros guardados para o relatório
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_MAX_ERRORS = 500
+
+# Opções de quantidade de linhas por página na aba Tabela
+TABLE_PAGE_SIZES = [25, 50, 100, 250]
+
+# Coluna com o identificador único de cada registro (usada nas exclusões)
+ID_COLUMN = "ID"
+
+# Quantidade de operações acumuladas no log a partir da qual ele é compactado no CSV.
+# Até lá os envios mais recentes estão só no log ("instagram_data.csv.log" e, durante a
+# compactação, ".log.old"), que faz parte dos dados: deve ser versionado ou copiado
+# junto com o CSV.
+COMPACT_THRESHOLD = 500
+
+# Divisão por ano dos backends de arquivos (ver CsvStorage), ligada com
+# BEIRAMA_ARCHIVE=1: a compactação tira os registros de anos anteriores do CSV (o
+# arquivo versionado no git) e os grava em arquivos anuais Parquet ao lado dele, que
+# passam a fazer parte dos dados e precisam ser versionados ou copiados junto com ele.
+# Desligada, os registros ficam todos no arquivo compactado; arquivos anuais já
+# existentes continuam sendo lidos.
+ARCHIVE_PREVIOUS_YEARS = os.environ.get("BEIRAMA_ARCHIVE") == "1"
+
+# Compressão dos arquivos anuais (Parquet) com os registros de anos anteriores
+ARCHIVE_COMPRESSION = "zstd"
+
+# Mapeamento de cada conjunto de dados para o arquivo CSV correspondente
+DATASETS = {
+    "instagram_data": "instagram_data.csv",
+    "facebook_data": "facebook_data.csv",
+    "linkedin_data": "linkedin_data.csv",
+    "email_mkt_data": "email_mkt_data.csv",
+    "youtube_data": "youtube_data.csv",
+    "midia_investimento_data": "midia_investimento_data.csv",
+    "midia_investimento_semanal_data": "midia_investimento_semanal_data.csv",
+    "custos_data": "custos_data.csv",
+    "site_beirama_data": "site_beirama_data.csv",
+    "site_beirama_semanal_data": "site_beirama_semanal_data.csv",
+    "resultados_google_data": "resultados_google_data.csv",
+    "resultados_meta_beirama_data": "resultados_meta_beirama_data.csv",
+    "performance_data": "performance_data.csv",
+}
+
+# Chave natural de cada conjunto de dados: campos que identificam um registro. Um envio
+# com a mesma chave de um registro existente substitui esse registro em vez de criar
+# outra linha (ver append_records).
+NATURAL_KEYS = {data_key: ["Data"] for data_key in DATASETS}
+
+# Lista dos meses do ano, na ordem do calendário
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+
+# Campos do formulário de cada conjunto de dados. Além de "date", "select" e "text",
+# os campos numéricos usam os tipos "integer", "decimal", "percent", "currency" e
+# "duration", que são validados e convertidos no envio e na leitura dos arquivos.
+FIELDS = {
+    "instagram_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Alcance", "label": "Alcance:", "type": "integer"},
+        {"name": "Engajamento", "label": "Engajamento:", "type": "integer"},
+        {"name": "Seguidores", "label": "Seguidores:", "type": "integer"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "facebook_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Alcance", "label": "Alcance:", "type": "integer"},
+        {"name": "Engajamento", "label": "Engajamento:", "type": "integer"},
+        {"name": "Seguidores", "label": "Seguidores:", "type": "integer"},
+        {"name": "Cliques", "label": "Cliques:", "type": "integer"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "linkedin_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Alcance", "label": "Alcance:", "type": "integer"},
+        {"name": "Cliques", "label": "Cliques:", "type": "integer"},
+        {"name": "Engajamento", "label": "Engajamento:", "type": "integer"},
+        {"name": "Seguidores", "label": "Seguidores:", "type": "integer"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "email_mkt_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Taxa de Abertura", "label": "Taxa de Abertura:", "type": "percent"},
+        {"name": "Cliques", "label": "Cliques:", "type": "integer"},
+        {"name": "Descadastro", "label": "Descadastro:", "type": "integer"},
+        {"name": "Receita Gerada", "label": "Receita Gerada:", "type": "currency"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "youtube_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Visualizações", "label": "Visualizações:", "type": "integer"},
+        {"name": "Duração Média da Visualização", "label": "Duração Média da Visualização:", "type": "duration"},
+        {"name": "Inscritos", "label": "Inscritos:", "type": "integer"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "midia_investimento_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Google(Display)", "label": "Google (Display):", "type": "currency"},
+        {"name": "Google(Search)", "label": "Google (Search):", "type": "currency"},
+        {"name": "Google(Youtube)", "label": "Google (YouTube):", "type": "currency"},
+        {"name": "Meta Ads", "label": "Meta Ads:", "type": "currency"},
+        {"name": "LinkedIn ADS", "label": "LinkedIn ADS:", "type": "currency"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "custos_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Beicast Aluguel espaço", "label": "Beicast Aluguel espaço:", "type": "currency"},
+        {"name": "Shopify", "label": "Shopify:", "type": "currency"},
+        {"name": "Custo Ramper MKT", "label": "Custo Ramper MKT:", "type": "currency"},
+        {"name": "Alex Gestor de tráfego", "label": "Alex Gestor de tráfego:", "type": "currency"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "site_beirama_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Sessões", "label": "Sessões:", "type": "integer"},
+        {"name": "Taxa de Rejeição (%)", "label": "Taxa de Rejeição (%):", "type": "percent"},
+        {"name": "Duração Média da Sessão", "label": "Duração Média da Sessão (min):", "type": "duration"},
+        {"name": "Taxa de Conversão (%)", "label": "Taxa de Conversão (%):", "type": "percent"},
+        {"name": "Páginas Mais Acessadas", "label": "Páginas Mais Acessadas:", "type": "text"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "resultados_google_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Cliques (Search)", "label": "Cliques (Google Search):", "type": "integer"},
+        {"name": "Cliques (Display)", "label": "Cliques (Google Display):", "type": "integer"},
+        {"name": "Contatos", "label": "Contatos (Cadastros/Conversões):", "type": "integer"},
+        {"name": "Negócios/Propostas", "label": "Negócios/Propostas (Volume):", "type": "integer"},
+        {"name": "Fechamento", "label": "Fechamento:", "type": "decimal"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "resultados_meta_beirama_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Cliques (Search)", "label": "Cliques (Google Search):", "type": "integer"},
+        {"name": "Cliques (Display)", "label": "Cliques (Google Display):", "type": "integer"},
+        {"name": "Contatos", "label": "Contatos (Cadastros/Conversões):", "type": "integer"},
+        {"name": "Negócios/Propostas", "label": "Negócios/Propostas (Volume):", "type": "integer"},
+        {"name": "Fechamento", "label": "Fechamento:", "type": "decimal"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "performance_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Margem de Contribuição", "label": "Margem de Contribuição (%):", "type": "percent"},
+        {"name": "Ticket Médio", "label": "Ticket Médio (R$):", "type": "currency"},
+        {"name": "ROI", "label": "ROI (%):", "type": "percent"},
+        {"name": "ROAS", "label": "ROAS:", "type": "decimal"},
+        {"name": "CPV", "label": "CPV (R$):", "type": "currency"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "site_beirama_semanal_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Sessões", "label": "Sessões:", "type": "integer"},
+        {"name": "Taxa de Rejeição", "label": "Taxa de Rejeição (%):", "type": "percent"},
+        {"name": "Duração Média da Sessão", "label": "Duração Média da Sessão (min):", "type": "duration"},
+        {"name": "Taxa de Conversão", "label": "Taxa de Conversão (%):", "type": "percent"},
+        {"name": "Páginas mais Acessadas", "label": "Páginas mais Acessadas:", "type": "text"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+    "midia_investimento_semanal_data": [
+        {"name": "Data", "label": "Data:", "type": "date"},
+        {"name": "Mês", "label": "Mês:", "type": "select", "options": MESES},
+        {"name": "Google(Display)", "label": "Google (Display):", "type": "currency"},
+        {"name": "Google(Search)", "label": "Google (Search):", "type": "currency"},
+        {"name": "Google(Youtube)", "label": "Google (YouTube):", "type": "currency"},
+        {"name": "Meta Ads", "label": "Meta Ads:", "type": "currency"},
+        {"name": "LinkedIn ADS", "label": "LinkedIn ADS:", "type": "currency"},
+        {"name": "Observação", "label": "Observação:", "type": "text"},
+    ],
+}
+
+# Tipos de campo numéricos e a expressão de um número com separador de milhar ("1.234.567")
+NUMERIC_TYPES = ("integer", "decimal", "percent", "currency", "duration")
+THOUSANDS_RE = re.compile(r"-?\d{1,3}(\.\d{3})+")
+
+# Tipo das colunas de texto em memória (strings armazenadas no formato do Arrow)
+ARROW_STRING = pd.StringDtype("pyarrow")
+
+# Expressão do mês de uma data no formato ISO ("2024-01")
+MONTH_RE = re.compile(r"\d{4}-\d{2}")
+
+# Agrupamentos de tempo dos gráficos: nome exibido -> frequência de período do pandas
+# (as semanas vão de segunda a domingo)
+BUCKETS = {"Dia": "D", "Semana": "W-SUN", "Mês": "M", "Trimestre": "Q", "Ano": "Y"}
+
+# Função para converter um valor numérico digitado no formato brasileiro ("1.234,56",
+# "R$ 10,00", "12,5%") ou internacional ("1234.56"). Sem vírgula, o ponto é lido como
+# separador de milhar em grupos de três dígitos nos campos inteiros e monetários
+# ("1.234" = 1234, "R$ 1.500" = 1500) e, nos demais, quando há mais de um ponto
+# ("1.500.000"); senão é o separador decimal ("1.5"). Durações aceitam
+# "mm:ss" ou "hh:mm:ss" e são guardadas em minutos. Retorna None para valores vazios
+# e levanta ValueError para valores inválidos.
+def parse_number(value, kind):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        number = float(value)
+    else:
+        text = "" if value is None else str(value)
+        text = text.replace("R$", "").replace("%", "").replace(" ", "").replace("\xa0", "")
+        if not text:
+            return None
+        if kind == "duration" and ":" in text:
+            parts = [float(part.replace(",", ".")) for part in text.split(":")]
+            if len(parts) > 3:
+                raise ValueError(value)
+            while len(parts) < 3:
+                parts.insert(0, 0.0)
+            number = parts[0] * 60 + parts[1] + parts[2] / 60
+        else:
+            if "," in text:
+                text = text.replace(".", "").replace(",", ".")
+            elif THOUSANDS_RE.fullmatch(text) and (kind in ("integer", "currency") or text.count(".") > 1):
+                text = text.replace(".", "")
+            number = float(text)
+    if math.isnan(number):
+        return None
+    if math.isinf(number):
+        raise ValueError(value)
+    if kind == "integer":
+        if not number.is_integer():
+            raise ValueError(value)
+        return int(number)
+    return number
+
+# Função para converter um registro de acordo com os campos do conjunto de dados.
+# Com strict=True levanta ValueError com os rótulos dos campos inválidos; caso
+# contrário os valores inválidos viram None (usado na leitura de arquivos antigos).
+def convert_record(record, fields, strict=False):
+    converted = dict(record)
+    invalid = []
+    for field in fields:
+        if field["type"] not in NUMERIC_TYPES or field["name"] not in converted:
+            continue
+        try:
+            converted[field["name"]] = parse_number(converted[field["name"]], field["type"])
+        except ValueError:
+            invalid.append(field["label"].rstrip(":"))
+            converted[field["name"]] = None
+    if strict and invalid:
+        raise ValueError(invalid)
+    return converted
+
+# Função para converter uma data de um arquivo importado (ISO ou dd/mm/aaaa, texto ou
+# célula de data do Excel)
+def parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = "" if value is None else str(value).strip()
+    if not text:
+        return None
+    for date_format in ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(value)
+
+# Função para simplificar um nome de coluna (sem acentos, espaços e pontuação) para
+# comparar as colunas de um arquivo importado com os campos do conjunto de dados
+def normalize_label(text):
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+# Função para sugerir a coluna do arquivo importado de cada campo (pelo nome ou rótulo)
+def guess_mapping(fields, columns):
+    by_label = {normalize_label(column): column for column in columns}
+    return {
+        field["name"]: by_label.get(normalize_label(field["name"])) or by_label.get(normalize_label(field["label"]))
+        for field in fields
+    }
+
+# Função para montar um registro a partir de uma linha de um arquivo importado, usando
+# mapping (campo -> coluna do arquivo). Levanta ValueError com a lista de erros da linha.
+# Sem coluna de mês, o mês é obtido da data.
+def import_row(row, fields, mapping):
+    record, errors, day = {}, [], None
+    for field in fields:
+        column = mapping.get(field["name"])
+        value = row.get(column) if column is not None else None
+        if isinstance(value, str):
+            value = value.strip()
+        label = field["label"].rstrip(":")
+        if field["type"] == "date":
+            try:
+                day = parse_date(value)
+            except ValueError:
+                errors.append(f"{label}: data inválida ({value})")
+            else:
+                if day is None:
+                    errors.append(f"{label}: obrigatória")
+            value = str(day) if day is not None else None
+        elif field["type"] == "select":
+            if not value and field["name"] == "Mês" and day is not None:
+                value = MESES[day.month - 1]
+            options = {normalize_label(option): option for option in field["options"]}
+            if not value:
+                errors.append(f"{label}: obrigatório")
+            elif normalize_label(value) not in options:
+                errors.append(f"{label}: valor fora das opções ({value})")
+            value = options.get(normalize_label(value)) if value else None
+        elif field["type"] not in NUMERIC_TYPES:
+            value = "" if value is None else str(value)
+        record[field["name"]] = value
+    try:
+        record = convert_record(record, fields, strict=True)
+    except ValueError as error:
+        errors.extend(f"{label}: número inválido" for label in error.args[0])
+    if errors:
+        raise ValueError(errors)
+    return record
+
+# Função para ler o cabeçalho de um arquivo CSV ou XLSX enviado para importação
+def read_import_columns(file, file_name):
+    chunks = read_import_chunks(file, file_name, chunk_size=1)
+    try:
+        return next(chunks, ([], []))[0]
+    finally:
+        chunks.close()
+
+# Função para ler um arquivo CSV ou XLSX em blocos de linhas, sem carregar o arquivo
+# inteiro em um DataFrame. Devolve (colunas, linhas) por bloco, com cada linha como
+# dicionário. No CSV o separador (vírgula ou ponto e vírgula) é detectado pelo cabeçalho.
+def read_import_chunks(file, file_name, chunk_size=IMPORT_CHUNK_SIZE):
+    file.seek(0)
+    if file_name.lower().endswith(".xlsx"):
+        import openpyxl  # só necessário para importar planilhas
+
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            columns = [str(column) if column is not None else "" for column in next(rows, ())]
+            chunk = []
+            for values in rows:
+                chunk.append(dict(zip(columns, values)))
+                if len(chunk) >= chunk_size:
+                    yield columns, chunk
+                    chunk = []
+            if chunk or not columns:
+                yield columns, chunk
+        finally:
+            workbook.close()
+        return
 
-# Função para carregar os dados de um arquivo CSV
-def load_data(file_path):
+    header = file.readline().decode("utf-8-sig", errors="ignore")
+    separator = ";" if header.count(";") > header.count(",") else ","
+    file.seek(0)
+    # O arquivo enviado continua aberto depois da leitura (detach), para poder ser lido de novo
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = pd.read_csv(text, sep=separator, dtype=str, keep_default_na=False, chunksize=chunk_size)
+        for chunk in reader:
+            yield list(chunk.columns), chunk.to_dict(orient="records")
+    finally:
+        text.detach()
+
+# Função para reduzir uma coluna numérica ao menor tipo sem perda: inteiros no menor
+# tipo inteiro que comporta os valores e decimais em float32 quando todos os valores
+# são representados exatamente (senão continuam em float64)
+def downcast(series):
+    series = pd.to_numeric(series, errors="coerce")
+    if series.size and series.notna().all() and (series % 1 == 0).all():
+        return pd.to_numeric(series.astype("int64"), downcast="integer")
+    compact = series.astype("float32")
+    if ((compact.astype("float64") == series) | series.isna()).all():
+        return compact
+    return series.astype("float64")
+
+# Função para deixar o DataFrame de um conjunto com tipos compactos: campos de seleção
+# (Mês) categóricos, números reduzidos com downcast e textos e IDs em strings do Arrow
+def compact_frame(df, fields):
+    for field in fields:
+        name = field["name"]
+        if name not in df:
+            continue
+        if field["type"] == "select":
+            extra = sorted(set(df[name].dropna().astype(str)) - set(field["options"]))
+            df[name] = pd.Categorical(df[name], categories=list(field["options"]) + extra)
+        elif field["type"] in NUMERIC_TYPES:
+            df[name] = downcast(df[name])
+        elif field["type"] == "text":
+            df[name] = df[name].astype(ARROW_STRING)
+    if ID_COLUMN in df:
+        df[ID_COLUMN] = df[ID_COLUMN].astype(ARROW_STRING)
+    return df
+
+# Função para montar o DataFrame tipado e compacto de um conjunto de dados (todos os
+# campos e o ID, ou só algumas colunas), ordenado por data
+def build_frame(data, fields, columns=None):
+    if columns is None:
+        columns = [field["name"] for field in fields] + [ID_COLUMN]
+    df = pd.DataFrame(data, columns=columns)
+    for field in fields:
+        name = field["name"]
+        if field["type"] == "date" and name in df:
+            df[name] = pd.to_datetime(df[name], errors="coerce")
+    if "Data" in df and not df.empty:
+        df = df.sort_values("Data", kind="stable").reset_index(drop=True)
+    return compact_frame(df, fields)
+
+# Função para converter linhas do DataFrame de um conjunto de volta em registros (datas
+# em texto ISO e valores ausentes como None), para as escritas e os agregados
+def frame_records(df):
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    for record in records:
+        if isinstance(record.get("Data"), (pd.Timestamp, datetime)):
+            record["Data"] = record["Data"].strftime("%Y-%m-%d")
+    return records
+
+# Função para ler um arquivo CSV como lista de registros (opcionalmente só algumas colunas)
+def read_csv(file_path, columns=None):
     if os.path.exists(file_path):
         try:
-            data = pd.read_csv(file_path)
+            # Lê tudo como texto: a conversão dos tipos é feita por convert_record
+            usecols = None if columns is None else (lambda name: name in columns)
+            data = pd.read_csv(file_path, dtype=str, usecols=usecols)
             if data.empty:
                 return []  # Retorna lista vazia se o arquivo estiver vazio
             return data.to_dict(orient="records")
@@ -17,43 +502,1305 @@ def load_data(file_path):
             return []  # Retorna lista vazia se não houver dados
     return []
 
-# Função para salvar os dados em um arquivo CSV
-def save_data(file_path, data):
-    df = pd.DataFrame(data)
-    df.to_csv(file_path, index=False)
-
-# Inicializa as listas para armazenar os dados e o estado de seleção
-if "instagram_data" not in st.session_state:
-    st.session_state.instagram_data = load_data("instagram_data.csv")
-if "facebook_data" not in st.session_state:
-    st.session_state.facebook_data = load_data("facebook_data.csv")
-if "linkedin_data" not in st.session_state:
-    st.session_state.linkedin_data = load_data("linkedin_data.csv")
-if "email_mkt_data" not in st.session_state:
-    st.session_state.email_mkt_data = load_data("email_mkt_data.csv")
-if "youtube_data" not in st.session_state:
-    st.session_state.youtube_data = load_data("youtube_data.csv")
-if "midia_investimento_data" not in st.session_state:
-    st.session_state.midia_investimento_data = load_data("midia_investimento_data.csv")
-if "midia_investimento_semanal_data" not in st.session_state:
-    st.session_state.midia_investimento_semanal_data = load_data("midia_investimento_semanal_data.csv")
-if "custos_data" not in st.session_state:
-    st.session_state.custos_data = load_data("custos_data.csv")
-if "site_beirama_data" not in st.session_state:
-    st.session_state.site_beirama_data = load_data("site_beirama_data.csv")
-if "site_beirama_semanal_data" not in st.session_state:
-    st.session_state.site_beirama_semanal_data = load_data("site_beirama_semanal_data.csv")
-if "resultados_google_data" not in st.session_state:
-    st.session_state.resultados_google_data = load_data("resultados_google_data.csv")
-if "resultados_meta_beirama_data" not in st.session_state:
-    st.session_state.resultados_meta_beirama_data = load_data("resultados_meta_beirama_data.csv")
-if "performance_data" not in st.session_state:
-    st.session_state.performance_data = load_data("performance_data.csv")
+# Função para salvar os registros em um arquivo CSV
+def write_csv(file_path, data):
+    pd.DataFrame(data).to_csv(file_path, index=False)
+
+# Função para ler um arquivo Parquet como lista de registros, lendo do disco apenas as
+# colunas pedidas
+def read_parquet(file_path, columns=None):
+    if not os.path.exists(file_path):
+        return []
+    if columns is not None:
+        schema = pq.read_schema(file_path)
+        columns = [name for name in schema.names if name in columns]
+    return pd.read_parquet(file_path, columns=columns).to_dict(orient="records")
+
+# Função para salvar os registros em um arquivo Parquet
+def write_parquet(file_path, data):
+    pd.DataFrame(data).to_parquet(file_path, index=False)
+
+# Função para salvar os registros de um ano anterior em um arquivo Parquet comprimido
+def write_archive(file_path, data):
+    pd.DataFrame(data).to_parquet(file_path, index=False, compression=ARCHIVE_COMPRESSION)
+
+# Função para obter o ano da data de um registro (None se a data estiver vazia ou inválida)
+def record_year(record):
+    year = str(record.get("Data") or "")[:4]
+    return int(year) if year.isdigit() else None
+
+# Função para filtrar registros por intervalo de datas ("AAAA-MM-DD", limites inclusos)
+def filter_by_date(records, start=None, end=None):
+    if start is None and end is None:
+        return records
+    return [
+        record for record in records
+        if (start is None or str(record.get("Data")) >= start)
+        and (end is None or str(record.get("Data")) <= end)
+    ]
+
+# Função para manter apenas as colunas pedidas de cada registro
+def project(records, columns=None):
+    if columns is None:
+        return records
+    return [{name: record.get(name) for name in columns} for record in records]
+
+# Função para obter a data de modificação (em nanossegundos) e o tamanho de um arquivo
+# (None se ele não existir)
+def file_mtime(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Função para obter o caminho do log de operações de um arquivo de dados
+def log_path(file_path):
+    return file_path + ".log"
+
+# Função para verificar se um arquivo de log termina em uma linha completa (um log
+# vazio ou inexistente também conta)
+def log_ends_with_newline(path):
+    try:
+        with open(path, "rb") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except FileNotFoundError:
+        return True
+
+# Função para ler as operações de um arquivo de log (uma operação JSON por linha)
+def read_log(path):
+    ops = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass  # Ignora linhas vazias ou truncadas por uma queda durante a escrita
+    return ops
+
+# Função para reaplicar operações do log sobre os registros indexados por ID. A
+# reaplicação é idempotente, então um log parcialmente compactado pode ser lido de novo.
+def replay_log(rows, ops):
+    for op in ops:
+        if op["op"] == "add":
+            rows[op["id"]] = op["row"]
+        elif op["op"] == "del":
+            rows.pop(op["id"], None)
+    return rows
+
+# Erro levantado quando uma escrita foi baseada em uma versão desatualizada dos dados
+# (outro usuário ou outro processo alterou o conjunto nesse meio tempo)
+class ConflictError(Exception):
+    pass
+
+# Erro levantado quando uma alteração na tabela deixaria dois registros com a mesma
+# chave natural (ver NATURAL_KEYS); args[0] tem as chaves repetidas
+class DuplicateKeyError(Exception):
+    pass
+
+# Trava de arquivo entre processos (vários workers do servidor), reentrante dentro do
+# mesmo processo: só a primeira aquisição de uma thread trava o arquivo no sistema
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.rlock = threading.RLock()
+        self.depth = 0
+        self.file = None
+
+    def __enter__(self):
+        self.rlock.acquire()
+        if self.depth == 0:
+            self.file = open(self.path, "a+")
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass  # LK_LOCK desiste após 10 segundos; tenta de novo
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            self.file.close()
+            self.file = None
+        self.rlock.release()
+
+# Função para obter um nome de arquivo temporário exclusivo deste processo e thread
+def tmp_path(file_path):
+    return f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+# Armazenamento em arquivos CSV: cada conjunto tem um CSV compactado e um log de
+# operações ao qual cada inclusão ou exclusão (marca de exclusão) é acrescentada.
+# Leituras e escritas de um conjunto são feitas com a trava de arquivo dele.
+# Com ARCHIVE_PREVIOUS_YEARS, os dados são divididos por ano: o arquivo compactado e o
+# log guardam o ano atual (e as escritas recentes de qualquer ano) e a compactação move
+# os registros de anos anteriores para arquivos anuais Parquet comprimidos
+# ("instagram_data.csv.2023.parquet"), lidos só quando o período pedido chega a eles.
+# Só vão para os arquivos anuais os registros com todos os valores válidos (ver
+# compact); os demais ficam no arquivo compactado, com o texto original. Um registro
+# do arquivo compactado ou do log tem precedência sobre o mesmo ID em um arquivo anual.
+class CsvStorage:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.locks = {}
+        self.log_sizes = {}
+        self.compacting = set()
+        self.unarchivable = {}
+
+    # Arquivo compactado do conjunto e funções de leitura e escrita desse arquivo
+    def snapshot_path(self, data_key):
+        return DATASETS[data_key]
+
+    def read_snapshot(self, file_path, columns=None):
+        return read_csv(file_path, columns)
+
+    def write_snapshot(self, file_path, data):
+        write_csv(file_path, data)
+
+    # Grava o arquivo compactado em um temporário e o troca de uma vez, para leitores
+    # concorrentes nunca verem um arquivo pela metade
+    def replace_snapshot(self, file_path, data):
+        path = tmp_path(file_path)
+        self.write_snapshot(path, data)
+        os.replace(path, file_path)
+
+    # Trava entre processos de um conjunto de dados
+    def locked(self, data_key):
+        with self.lock:
+            if data_key not in self.locks:
+                self.locks[data_key] = FileLock(self.snapshot_path(data_key) + ".lock")
+            return self.locks[data_key]
+
+    # Arquivo anual de um ano anterior e arquivos anuais existentes do conjunto, por ano
+    def archive_path(self, data_key, year):
+        return f"{self.snapshot_path(data_key)}.{year}.parquet"
+
+    def archives(self, data_key):
+        base = self.snapshot_path(data_key)
+        paths = {}
+        for path in glob.glob(glob.escape(base) + ".*.parquet"):
+            year = path[len(base) + 1:-len(".parquet")]
+            if year.isdigit():
+                paths[int(year)] = path
+        return paths
+
+    # Marca de alteração do conjunto: um contador gravado em um arquivo ao lado dos dados,
+    # incrementado só pelas escritas (bump_version), junto com a impressão digital dos
+    # arquivos de dados (fingerprint) deixados pela última escrita ou compactação. A
+    # compactação e a divisão por ano reorganizam os arquivos sem mudar os dados, então
+    # registram a impressão digital nova sem mudar o contador. Se os arquivos mudaram por
+    # fora (git pull, backup restaurado, edição à mão), a marca passa a incluir a
+    # impressão digital atual, e o que foi lido ou publicado antes deixa de valer.
+    def version_path(self, data_key):
+        return self.snapshot_path(data_key) + ".version"
+
+    # Data de modificação e tamanho do arquivo compactado, dos logs e dos arquivos anuais
+    def fingerprint(self, data_key):
+        file_path = self.snapshot_path(data_key)
+        paths = [file_path, log_path(file_path), log_path(file_path) + ".old"]
+        paths += [path for _, path in sorted(self.archives(data_key).items())]
+        return [[os.path.basename(path), *stat] for path in paths if (stat := file_mtime(path)) is not None]
+
+    def read_version(self, data_key):
+        try:
+            with open(self.version_path(data_key), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0, None
+        if isinstance(state, int):
+            return state, None  # Formato antigo, só com o contador
+        return state.get("version", 0), state.get("files")
+
+    def token(self, data_key):
+        version, files = self.read_version(data_key)
+        current = self.fingerprint(data_key)
+        return version if files == current else [version, current]
+
+    # Grava o contador e a impressão digital atual dos arquivos (chamada com a trava do
+    # conjunto adquirida). O arquivo novo é trocado de uma vez, então quem lê sem a trava
+    # nunca vê um valor pela metade.
+    def record_version(self, data_key, version):
+        path = self.version_path(data_key)
+        tmp = tmp_path(path)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "files": self.fingerprint(data_key)}, f)
+        os.replace(tmp, path)
+
+    def bump_version(self, data_key):
+        self.record_version(data_key, self.read_version(data_key)[0] + 1)
+
+    # Registra a impressão digital depois de a compactação reorganizar os arquivos (ou de
+    # uma escrita desfeita), desde que eles correspondessem à última escrita (intact,
+    # obtido com token antes da troca): uma alteração feita por fora continua sendo notada.
+    def keep_version(self, data_key, intact):
+        if intact:
+            self.record_version(data_key, self.read_version(data_key)[0])
+
+    def load(self, data_key, start=None, end=None, columns=None):
+        file_path = self.snapshot_path(data_key)
+        wanted = None if columns is None else set(columns) | {ID_COLUMN, "Data"}
+        with self.locked(data_key):
+            records = self.read_snapshot(file_path, wanted)
+            if records and ID_COLUMN not in records[0]:
+                # Migração única: arquivos antigos não têm identificador
+                records = self.read_snapshot(file_path)
+                for record in records:
+                    record[ID_COLUMN] = uuid.uuid4().hex
+                intact = not isinstance(self.token(data_key), list)
+                self.replace_snapshot(file_path, records)
+                self.keep_version(data_key, intact)
+
+            ops = read_log(log_path(file_path) + ".old") + read_log(log_path(file_path))
+            rows = replay_log({record[ID_COLUMN]: record for record in records}, ops)
+            self.log_sizes[data_key] = len(ops)
+
+            # Arquivos anuais só dos anos do período, sem os registros que o arquivo
+            # compactado ou o log substituem ou apagam
+            hot_ids = {record[ID_COLUMN] for record in records} | {op["id"] for op in ops}
+            archived = []
+            for year, path in sorted(self.archives(data_key).items()):
+                if (start is None or year >= int(start[:4])) and (end is None or year <= int(end[:4])):
+                    archived += [record for record in read_parquet(path, wanted) if record[ID_COLUMN] not in hot_ids]
+
+        # Registros de anos anteriores no arquivo compactado (virada do ano, arquivos
+        # antigos) são movidos para os arquivos anuais em segundo plano, exceto os que
+        # a compactação já deixou no arquivo por terem valores inválidos
+        if ARCHIVE_PREVIOUS_YEARS:
+            unarchivable = self.unarchivable.get(data_key, ())
+            if any(
+                (record_year(record) or date.today().year) < date.today().year and record[ID_COLUMN] not in unarchivable
+                for record in rows.values()
+            ):
+                self.schedule_compact(data_key)
+        return project(filter_by_date(archived + list(rows.values()), start, end), columns)
+
+    # Alterações em lote (registros incluídos, registros alterados e IDs apagados) em uma
+    # única escrita no log. Reaplicar um "add" com um ID existente substitui o registro.
+    def apply(self, data_key, added, updated, deleted_ids):
+        with self.batch(data_key) as write:
+            write(added, updated, deleted_ids)
+
+    # Escrita no log em várias partes (write(added, updated, deleted_ids) para cada
+    # parte), com a trava adquirida do início ao fim: as operações são acrescentadas ao
+    # log à medida que chegam e gravadas no disco (fsync) uma vez no final. Se algo
+    # falhar no meio, o log volta ao tamanho de antes e nenhuma parte vale. Se uma queda
+    # deixou a última linha pela metade, as operações começam em uma linha nova (senão
+    # seriam coladas à linha truncada e ignoradas junto com ela por read_log). Dispara a
+    # compactação em segundo plano quando o log fica grande.
+    @contextmanager
+    def batch(self, data_key):
+        file_path = self.snapshot_path(data_key)
+        count = 0
+        with self.locked(data_key):
+            intact = not isinstance(self.token(data_key), list)
+            prefix = "" if log_ends_with_newline(log_path(file_path)) else "\n"
+            with open(log_path(file_path), "a", encoding="utf-8") as f:
+                start = f.tell()
+
+                def write(added, updated, deleted_ids):
+                    nonlocal prefix, count
+                    ops = [{"op": "add", "id": record[ID_COLUMN], "row": record} for record in list(added) + list(updated)]
+                    ops += [{"op": "del", "id": record_id} for record_id in deleted_ids]
+                    f.write(prefix + "".join(json.dumps(op, ensure_ascii=False, default=str) + "\n" for op in ops))
+                    prefix = ""
+                    count += len(ops)
+
+                try:
+                    yield write
+                    f.flush()
+                    os.fsync(f.fileno())
+                except BaseException:
+                    f.flush()
+                    f.truncate(start)
+                    self.keep_version(data_key, intact)
+                    raise
+            if not count:
+                return
+            self.bump_version(data_key)
+            self.log_sizes[data_key] = self.log_sizes.get(data_key, 0) + count
+            if self.log_sizes[data_key] < COMPACT_THRESHOLD:
+                return
+        self.schedule_compact(data_key)
+
+    # Dispara a compactação de um conjunto em segundo plano (se ainda não está em andamento)
+    def schedule_compact(self, data_key):
+        with self.lock:
+            if data_key in self.compacting:
+                return
+            self.compacting.add(data_key)
+        threading.Thread(target=self.compact, args=(data_key,), daemon=True).start()
+
+    # Compacta o log de volta no arquivo. O log é renomeado com a trava adquirida (novas
+    # escritas vão para um log novo) e os arquivos são montados fora da trava, sem
+    # bloquear quem está enviando formulários: os registros do ano atual vão para o
+    # arquivo compactado e os de anos anteriores para os arquivos anuais, que são
+    # reescritos só quando recebem registros ou têm registros alterados ou apagados no
+    # log. Se o arquivo foi substituído nesse meio tempo (pela migração dos arquivos sem
+    # identificador), o resultado é descartado.
+    def compact(self, data_key):
+        file_path = self.snapshot_path(data_key)
+        old_path = log_path(file_path) + ".old"
+        path = tmp_path(file_path)
+        archive_tmps = {}
+        try:
+            # Só um processo compacta um conjunto por vez; um log antigo que sobrou de
+            # uma compactação interrompida é compactado antes de o log atual ser renomeado
+            with FileLock(file_path + ".compact.lock"):
+                with self.locked(data_key):
+                    if not os.path.exists(old_path) and os.path.exists(log_path(file_path)):
+                        intact = not isinstance(self.token(data_key), list)
+                        os.replace(log_path(file_path), old_path)
+                        self.keep_version(data_key, intact)
+                        self.log_sizes[data_key] = 0
+                    snapshot = file_mtime(file_path)
+
+                ops = read_log(old_path)
+                rows = {record[ID_COLUMN]: record for record in self.read_snapshot(file_path)}
+                rows = replay_log(rows, ops)
+                # Os registros de anos anteriores são convertidos com strict=True: um valor
+                # que não é um número válido ("10 mil") não é apagado, o registro fica no
+                # arquivo compactado com o texto original
+                current_year = date.today().year
+                hot, cold, unarchivable = [], {}, set()
+                for record in rows.values():
+                    year = record_year(record)
+                    if ARCHIVE_PREVIOUS_YEARS and year is not None and year < current_year:
+                        try:
+                            converted = convert_record(record, FIELDS[data_key], strict=True)
+                        except ValueError as error:
+                            unarchivable.add(record[ID_COLUMN])
+                            logger.warning("%s: registro %s mantido em %s, valores inválidos: %s",
+                                data_key, record[ID_COLUMN], file_path, ", ".join(error.args[0]))
+                        else:
+                            cold.setdefault(year, []).append(converted)
+                            continue
+                    hot.append(record)
+                self.unarchivable[data_key] = unarchivable
+
+                # Os registros que estão no arquivo compactado ou que o log alterou ou
+                # apagou saem dos arquivos anuais (continuam só onde vão estar agora)
+                dropped = set(rows) | {op["id"] for op in ops}
+                archives = self.archives(data_key)
+                for year, archive in archives.items():
+                    if year in cold or not dropped.isdisjoint(record[ID_COLUMN] for record in read_parquet(archive, [ID_COLUMN])):
+                        kept = [record for record in read_parquet(archive) if record[ID_COLUMN] not in dropped]
+                        cold[year] = kept + cold.get(year, [])
+                for year, records in cold.items():
+                    archive_tmps[year] = tmp_path(self.archive_path(data_key, year))
+                    if records:
+                        write_archive(archive_tmps[year], records)
+                self.write_snapshot(path, hot)
+
+                with self.locked(data_key):
+                    if file_mtime(file_path) == snapshot:
+                        intact = not isinstance(self.token(data_key), list)
+                        for year, archive_tmp in archive_tmps.items():
+                            if os.path.exists(archive_tmp):
+                                os.replace(archive_tmp, self.archive_path(data_key, year))
+                            elif year in archives:
+                                os.remove(archives[year])
+                        os.replace(path, file_path)
+                        if os.path.exists(old_path):
+                            os.remove(old_path)
+                        self.keep_version(data_key, intact)
+        finally:
+            for leftover in [path] + list(archive_tmps.values()):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            with self.lock:
+                self.compacting.discard(data_key)
+
+# Armazenamento em Parquet: igual ao CSV (arquivo compactado + log de operações), mas
+# o arquivo compactado é colunar e tipado, então os gráficos leem só as colunas que usam
+class ParquetStorage(CsvStorage):
+    def snapshot_path(self, data_key):
+        return os.path.splitext(DATASETS[data_key])[0] + ".parquet"
+
+    def read_snapshot(self, file_path, columns=None):
+        return read_parquet(file_path, columns)
+
+    def write_snapshot(self, file_path, data):
+        write_parquet(file_path, data)
+
+    def load(self, data_key, start=None, end=None, columns=None):
+        file_path = self.snapshot_path(data_key)
+        with self.locked(data_key):
+            if not os.path.exists(file_path) and not os.path.exists(log_path(file_path)):
+                # Migração única a partir do CSV (que continua disponível como exportação)
+                records = CsvStorage().load(data_key)
+                self.replace_snapshot(file_path, [convert_record(r, FIELDS[data_key]) for r in records])
+            return super().load(data_key, start, end, columns)
+
+# Função para colocar um nome de tabela ou coluna entre aspas no SQL
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+# Tipos das colunas no SQLite de acordo com o tipo do campo
+SQL_TYPES = {"integer": "INTEGER", "decimal": "REAL", "percent": "REAL", "currency": "REAL", "duration": "REAL"}
+
+# Armazenamento em SQLite: uma tabela por conjunto de dados, com índices em Data e Mês,
+# e uma tabela de versões incrementada na mesma transação de cada escrita
+class SqliteStorage:
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.locks = {}
+        conn = self.connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS _versions (dataset TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        for data_key in DATASETS:
+            self.create_table(data_key)
+
+    # Trava entre processos de um conjunto de dados
+    def locked(self, data_key):
+        with self.lock:
+            if data_key not in self.locks:
+                self.locks[data_key] = FileLock(f"{self.path}.{data_key}.lock")
+            return self.locks[data_key]
+
+    # Cada thread (sessão do Streamlit) usa sua própria conexão
+    def connect(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def columns(self, data_key):
+        return [ID_COLUMN] + [field["name"] for field in FIELDS[data_key]]
+
+    def create_table(self, data_key):
+        conn = self.connect()
+        table = quote(data_key)
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (data_key,)
+        ).fetchone()
+        with conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({quote(ID_COLUMN)} TEXT PRIMARY KEY)")
+            existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for field in FIELDS[data_key]:
+                if field["name"] not in existing:
+                    sql_type = SQL_TYPES.get(field["type"], "TEXT")
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {quote(field['name'])} {sql_type}")
+            for name in ("Data", "Mês"):
+                if name in existing or any(field["name"] == name for field in FIELDS[data_key]):
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {quote(data_key + '_' + name)} ON {table} ({quote(name)})")
+            conn.execute("INSERT OR IGNORE INTO _versions (dataset, version) VALUES (?, 0)", (data_key,))
+        if not exists:
+            self.migrate(data_key)
+
+    # Migração única dos arquivos CSV existentes para a tabela recém-criada
+    def migrate(self, data_key):
+        records = [convert_record(record, FIELDS[data_key]) for record in CsvStorage().load(data_key)]
+        if records:
+            self.write(data_key, records)
+
+    # Incrementa a versão do conjunto (chamada dentro da transação da escrita)
+    def bump(self, conn, data_key):
+        conn.execute("UPDATE _versions SET version = version + 1 WHERE dataset = ?", (data_key,))
+
+    def write(self, data_key, records):
+        conn = self.connect()
+        columns = self.columns(data_key)
+        sql = (
+            f"INSERT INTO {quote(data_key)} ({', '.join(quote(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        with conn:
+            conn.executemany(sql, [[record.get(c) for c in columns] for record in records])
+            self.bump(conn, data_key)
+
+    def token(self, data_key):
+        row = self.connect().execute("SELECT version FROM _versions WHERE dataset = ?", (data_key,)).fetchone()
+        return row["version"] if row else None
+
+    def load(self, data_key, start=None, end=None, columns=None):
+        selected = "*"
+        if columns is not None:
+            selected = ", ".join(quote(name) for name in self.columns(data_key) if name in columns)
+        conditions, params = [], []
+        if start is not None:
+            conditions.append(f"{quote('Data')} >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append(f"{quote('Data')} <= ?")
+            params.append(end)
+        sql = f"SELECT {selected} FROM {quote(data_key)}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY rowid"
+        return [dict(row) for row in self.connect().execute(sql, params)]
+
+    # Alterações em lote em uma única transação (os registros alterados mantêm a posição)
+    def apply(self, data_key, added, updated, deleted_ids):
+        with self.batch(data_key) as write:
+            write(added, updated, deleted_ids)
+
+    # Escrita em várias partes (write(added, updated, deleted_ids) para cada parte) em
+    # uma única transação: se algo falhar no meio, nenhuma parte vale
+    @contextmanager
+    def batch(self, data_key):
+        conn = self.connect()
+        table = quote(data_key)
+        columns = self.columns(data_key)
+        names = [name for name in columns if name != ID_COLUMN]
+        insert_sql = f"INSERT INTO {table} ({', '.join(quote(c) for c in columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        update_sql = f"UPDATE {table} SET {', '.join(quote(c) + ' = ?' for c in names)} WHERE {quote(ID_COLUMN)} = ?"
+
+        count = 0
+
+        def write(added, updated, deleted_ids):
+            nonlocal count
+            count += len(added) + len(updated) + len(deleted_ids)
+            conn.executemany(insert_sql, [[record.get(c) for c in columns] for record in added])
+            conn.executemany(update_sql, [[record.get(c) for c in names] + [record[ID_COLUMN]] for record in updated])
+            conn.executemany(f"DELETE FROM {table} WHERE {quote(ID_COLUMN)} = ?", [(record_id,) for record_id in deleted_ids])
+
+        with conn:
+            yield write
+            if count:
+                self.bump(conn, data_key)
+
+# Armazenamento compartilhado por todas as sessões do processo: o backend de
+# armazenamento e uma única cópia de cada conjunto de dados, com a marca de alteração
+# do backend, um contador de versão e um lock próprio (ver dataset_entry). O lock do
+# armazenamento só protege o dicionário de conjuntos. Uma thread (watch_store)
+# acompanha as alterações feitas por outros processos.
+@st.cache_resource
+def get_store():
+    if STORAGE_BACKEND == "sqlite":
+        storage = SqliteStorage(DATABASE_PATH)
+    elif STORAGE_BACKEND == "parquet":
+        storage = ParquetStorage()
+    else:
+        storage = CsvStorage()
+    store = {"lock": threading.Lock(), "datasets": {}, "storage": storage}
+    threading.Thread(target=watch_store, args=(store,), daemon=True).start()
+    return store
+
+# Função executada em segundo plano que, a cada WATCH_INTERVAL segundos, compara a marca
+# de alteração do backend de cada conjunto já carregado (contador de escritas dos
+# arquivos ou versão no SQLite). Um conjunto alterado por outro processo é descartado da memória e ganha uma
+# versão nova, que as sessões abertas percebem sem consultar o backend (watch_dataset);
+# os demais conjuntos continuam em memória.
+# Um conjunto ocupado (sendo lido ou gravado) fica para a próxima verificação.
+def watch_store(store):
+    while True:
+        time.sleep(WATCH_INTERVAL)
+        with store["lock"]:
+            entries = list(store["datasets"].items())
+        for data_key, entry in entries:
+            if not entry["lock"].acquire(blocking=False):
+                continue
+            try:
+                refresh_entry(store, data_key, entry)
+            except (OSError, sqlite3.Error):
+                pass  # Tenta de novo na próxima verificação
+            finally:
+                entry["lock"].release()
+
+# Função para obter o backend de armazenamento do processo
+def get_storage():
+    return get_store()["storage"]
+
+# Função para carregar os registros de um conjunto de dados do armazenamento,
+# opcionalmente só os de um intervalo de datas e só algumas colunas
+def load_data(data_key, start=None, end=None, columns=None):
+    start = str(start) if start is not None else None
+    end = str(end) if end is not None else None
+    return get_storage().load(data_key, start, end, columns)
+
+# Função para usar a entrada de um conjunto no armazenamento compartilhado com o lock
+# dele adquirido (com write=True, também a trava entre processos do backend), já
+# atualizada com refresh_entry. Leituras e escritas do backend de um conjunto só
+# bloqueiam quem usa esse mesmo conjunto.
+@contextmanager
+def dataset_entry(data_key, write=False):
+    store = get_store()
+    with store["lock"]:
+        if data_key not in store["datasets"]:
+            store["datasets"][data_key] = {
+                "lock": threading.RLock(), "frame": None, "since": None, "mapped": False, "frames": {},
+                "monthly": None, "index": None, "token": None, "version": None,
+            }
+        entry = store["datasets"][data_key]
+    with entry["lock"]:
+        if write:
+            with store["storage"].locked(data_key):
+                yield refresh_entry(store, data_key, entry)
+        else:
+            yield refresh_entry(store, data_key, entry)
+
+# Função para descartar os dados em memória de um conjunto se o backend foi alterado,
+# dando uma versão nova à entrada (chamada com o lock da entrada adquirido). Cada
+# conjunto fica em memória como um único DataFrame compacto ("frame"), lido do backend
+# só quando alguém o pede (entry_frame) e só a partir do ano pedido ("since", None
+# quando tem todos os anos).
+def refresh_entry(store, data_key, entry):
+    token = store["storage"].token(data_key)
+    if entry["version"] is None or entry["token"] != token:
+        entry.update(
+            frame=None, since=None, mapped=False, frames={}, monthly=None, index=None, token=token,
+            version=0 if entry["version"] is None else entry["version"] + 1,
+        )
+    return entry
+
+# Função para somar (sign=1) ou subtrair (sign=-1) os valores numéricos de um registro
+# nos agregados mensais de um conjunto de dados. O mês vem da data do registro
+# ("2024-01"), não do campo Mês digitado, então anos diferentes não se misturam.
+def update_monthly(monthly, record, fields, sign):
+    month = str(record.get("Data") or "")[:7]
+    if not MONTH_RE.fullmatch(month):
+        return
+    totals = monthly.setdefault(month, {"_rows": 0})
+    totals["_rows"] += sign
+    for field in fields:
+        value = record.get(field["name"])
+        if field["type"] in NUMERIC_TYPES and value is not None and not math.isnan(value):
+            totals[field["name"]] = totals.get(field["name"], 0) + sign * value
+    if totals["_rows"] <= 0:
+        del monthly[month]
+
+# Função para publicar o novo DataFrame de um conjunto após uma escrita no backend.
+# O DataFrame anterior não é alterado, então quem já o leu continua com uma cópia
+# consistente. Os agregados mensais e o índice das chaves naturais são atualizados só
+# com os registros incluídos (added) e excluídos (removed); sem eles (substituição
+# completa) são recalculados no próximo uso. (deve ser chamada com o lock da
+# entrada adquirido)
+def commit_entry(store, data_key, frame, added=None, removed=None):
+    entry = store["datasets"][data_key]
+    entry["frame"] = frame
+    entry["mapped"] = False
+    entry["frames"] = {}
+    entry["token"] = store["storage"].token(data_key)
+    entry["version"] += 1
+    if added is None and removed is None:
+        entry["monthly"] = None
+        entry["index"] = None
+        entry["since"] = None
+    else:
+        update_entry(data_key, entry, added or [], removed or [])
+    if entry["since"] is None:
+        publish_snapshot(data_key, frame, entry["token"])
+
+# Função para atualizar os agregados mensais e o índice das chaves naturais de uma
+# entrada com os registros incluídos (added) e excluídos (removed) por uma escrita
+# (chamada com o lock da entrada adquirido)
+def update_entry(data_key, entry, added, removed):
+    if entry["monthly"] is not None:
+        for record in added:
+            update_monthly(entry["monthly"], record, FIELDS[data_key], 1)
+        for record in removed:
+            update_monthly(entry["monthly"], record, FIELDS[data_key], -1)
+    if entry["index"] is not None:
+        for record in removed:
+            key = record_key(data_key, record)
+            if key is not None and entry["index"].get(key) == record[ID_COLUMN]:
+                del entry["index"][key]
+        for record in added:
+            key = record_key(data_key, record)
+            if key is not None:
+                entry["index"][key] = record[ID_COLUMN]
+
+# Função para obter o arquivo do instantâneo Arrow de um conjunto de dados
+def snapshot_file(data_key):
+    return os.path.join(SNAPSHOT_DIR, f"{data_key}.{STORAGE_BACKEND}.arrow")
+
+# Função para publicar o DataFrame completo de um conjunto como instantâneo Arrow (IPC,
+# sem compressão, para poder ser mapeado na memória), junto com a marca de alteração
+# do backend a que ele corresponde. O arquivo é gravado em um temporário e trocado de
+# uma vez, então os processos que já o mapearam continuam com a versão anterior.
+def publish_snapshot(data_key, frame, token):
+    path = snapshot_file(data_key)
+    tmp = tmp_path(path)
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({**table.schema.metadata, b"token": json.dumps(token).encode()})
+        with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # O instantâneo é só um atalho; sem ele os processos leem o backend
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+# Função para abrir o instantâneo Arrow de um conjunto mapeado na memória (somente
+# leitura), se ele corresponde à marca de alteração token. As colunas numéricas e de
+# texto apontam direto para as páginas do arquivo, que o sistema compartilha entre os
+# processos; devolve None se não há instantâneo válido.
+def open_snapshot(data_key, token):
+    try:
+        table = pa.ipc.open_file(pa.memory_map(snapshot_file(data_key), "r")).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if (table.schema.metadata or {}).get(b"token") != json.dumps(token).encode():
+        return None
+    return table.to_pandas(split_blocks=True)
+
+# Função para obter o primeiro dia de um ano no formato das datas ("AAAA-MM-DD")
+def year_start(year):
+    return f"{year}-01-01" if year is not None else None
+
+# Função para obter o DataFrame de uma entrada com todos os registros a partir do ano
+# since (None para todos os anos), lendo do backend só o que falta: na primeira leitura,
+# os registros desde since; depois, só os anos anteriores que passaram a ser pedidos,
+# juntados ao DataFrame. Com o DataFrame em memória ele é devolvido sem cópia (pode ter
+# colunas e anos além dos pedidos); senão, com columns, só essas colunas são lidas do
+# backend e o resultado fica guardado por conjunto de colunas e ano. (chamada com o lock
+# da entrada adquirido)
+def entry_frame(data_key, entry, columns=None, since=None):
+    frame = entry["frame"]
+    if frame is not None and (entry["since"] is None or (since is not None and since >= entry["since"])):
+        return frame
+    fields = FIELDS[data_key]
+    if frame is None:
+        # Instantâneo publicado por outro processo (ou por este) para a versão atual
+        frame = open_snapshot(data_key, entry["token"])
+        if frame is not None:
+            entry.update(frame=frame, since=None, mapped=True, frames={})
+            return frame
+    if columns is None:
+        if frame is None:
+            records = [convert_record(record, fields) for record in load_data(data_key, start=year_start(since))]
+            entry["frame"] = build_frame(records, fields)
+            if since is None:
+                publish_snapshot(data_key, entry["frame"], entry["token"])
+        else:
+            # Os registros escritos depois da primeira leitura já estão no DataFrame
+            loaded = set(frame[ID_COLUMN])
+            records = load_data(data_key, start=year_start(since), end=f"{entry['since'] - 1}-12-31")
+            records = [convert_record(record, fields) for record in records if record[ID_COLUMN] not in loaded]
+            entry["frame"] = merge_frame(data_key, frame, records)
+            entry["index"] = None
+        entry["since"] = since
+        entry["frames"] = {}
+        return entry["frame"]
+    frame_key = (tuple(columns), since)
+    if frame_key not in entry["frames"]:
+        fields = [field for field in fields if field["name"] in columns]
+        records = load_data(data_key, start=year_start(since), columns=columns)
+        records = [convert_record(record, fields) for record in records]
+        entry["frames"][frame_key] = build_frame(records, fields, columns)
+    return entry["frames"][frame_key]
+
+# Função para montar o novo DataFrame de um conjunto após uma escrita: sem os registros
+# de dropped_ids e com os registros de records, em ordem de data e com tipos compactos.
+# Só os registros novos são convertidos e compactados; as categorias do DataFrame só
+# ganham os valores novos e as colunas numéricas só mudam de tipo se os valores novos
+# não couberem no tipo atual (promoção do concat). Registros com data a partir da
+# última já vão para o final; os demais são encaixados por busca binária na coluna Data.
+def merge_frame(data_key, frame, records=(), dropped_ids=()):
+    if dropped_ids:
+        frame = frame[~frame[ID_COLUMN].isin(dropped_ids)]
+    if not records:
+        return frame
+    new = build_frame(records, FIELDS[data_key])
+    if frame.empty:
+        return new
+    for name in frame.columns:
+        if isinstance(frame[name].dtype, pd.CategoricalDtype):
+            extra = new[name].cat.categories.difference(frame[name].cat.categories)
+            if len(extra):
+                frame = frame.assign(**{name: frame[name].cat.add_categories(extra)})
+            new[name] = new[name].cat.set_categories(frame[name].cat.categories)
+    merged = pd.concat([frame, new], ignore_index=True)
+    last = frame["Data"].iloc[-1]
+    if pd.isna(last) or new["Data"].isna().any() or new["Data"].iloc[0] < last:
+        position = frame["Data"].searchsorted(new["Data"], side="right")
+        order = np.argsort(np.concatenate([np.arange(len(frame)), position - 0.5]), kind="stable")
+        merged = merged.take(order).reset_index(drop=True)
+    return merged
+
+# Função para obter a chave natural de um registro (ver NATURAL_KEYS), ou None se algum
+# campo da chave estiver vazio (esses registros nunca substituem outros)
+def record_key(data_key, record):
+    key = tuple(record.get(name) for name in NATURAL_KEYS[data_key])
+    if any(value is None or value == "" for value in key):
+        return None
+    return tuple(str(value) for value in key)
+
+# Função para obter o índice das chaves naturais de um conjunto: um dicionário da chave
+# para o ID do registro, para localizar em tempo constante o registro de um envio. É
+# montado uma vez por leitura do backend e depois mantido pelas escritas (commit_entry).
+# Cobre os anos em memória (a partir de since, ver entry_frame). Com registros
+# repetidos (anteriores à chave), vale o último na ordem do DataFrame. (chamada com o
+# lock da entrada adquirido)
+def entry_index(data_key, entry, since=None):
+    frame = entry_frame(data_key, entry, since=since)
+    if entry["index"] is None:
+        index = {}
+        for record in frame_records(frame[NATURAL_KEYS[data_key] + [ID_COLUMN]]):
+            key = record_key(data_key, record)
+            if key is not None:
+                index[key] = record[ID_COLUMN]
+        entry["index"] = index
+    return entry["index"]
+
+# Função para recortar um DataFrame ordenado por data a um período (start/end, inclusive)
+# e a alguns meses do ano (pela data). O período é localizado por busca binária na
+# coluna Data, então o custo é proporcional ao recorte e não ao histórico inteiro.
+def window(df, start=None, end=None, months=None):
+    if df.empty or "Data" not in df:
+        return df
+    if start is not None or end is not None:
+        first = df["Data"].searchsorted(pd.Timestamp(start), side="left") if start is not None else 0
+        last = df["Data"].searchsorted(pd.Timestamp(end), side="right") if end is not None else len(df)
+        df = df.iloc[first:last]
+    if months:
+        df = df[df["Data"].dt.month.isin([MESES.index(month) + 1 for month in months])]
+    return df
+
+# Função para obter o DataFrame tipado de um conjunto de dados (somente leitura). Ele é
+# montado uma vez e compartilhado (as escritas o atualizam), então os gráficos e a
+# tabela não convertem nada. Com start/end/months, devolve só o recorte (ver window).
+def get_frame(data_key, columns=None, start=None, end=None, months=None):
+    since = pd.Timestamp(start).year if start is not None else None
+    with dataset_entry(data_key) as entry:
+        df = entry_frame(data_key, entry, columns, since)
+    return window(df, start, end, months)
+
+# Função para filtrar e ordenar o DataFrame de um conjunto de dados no servidor, para a
+# aba Tabela enviar ao navegador só a página visível. Filtra pelo período (ver window)
+# e por faixa de valores de uma coluna numérica (column entre low e high); "Mês" é
+# ordenado na ordem do calendário.
+def query_frame(data_key, months=None, start=None, end=None, column=None, low=None, high=None,
+                sort_by="Data", ascending=True):
+    df = get_frame(data_key, start=start, end=end, months=months)
+    if df.empty:
+        return df
+    mask = pd.Series(True, index=df.index)
+    if column is not None and low is not None:
+        mask &= df[column] >= low
+    if column is not None and high is not None:
+        mask &= df[column] <= high
+    df = df[mask]
+    if sort_by == "Mês":
+        order = {month: i for i, month in enumerate(MESES)}
+        return df.sort_values("Mês", ascending=ascending, kind="stable", key=lambda col: col.map(order))
+    if sort_by != "Data" or not ascending:
+        return df.sort_values(sort_by, ascending=ascending, kind="stable", na_position="last")
+    return df
+
+# Função para calcular várias métricas de uma vez, em uma única passada agrupada:
+# metrics mapeia o nome de cada coluna do resultado para (coluna, função), como no
+# agg do pandas
+def aggregate(df, by, metrics):
+    return df.groupby(by, sort=False, observed=True).agg(**metrics)
+
+# Função para calcular do zero as somas mensais das colunas numéricas de um conjunto,
+# no formato mantido por update_monthly (chamada com o lock da entrada adquirido)
+def monthly_totals(data_key, entry):
+    numeric = [field["name"] for field in FIELDS[data_key] if field["type"] in NUMERIC_TYPES]
+    df = entry_frame(data_key, entry, ["Data"] + numeric).dropna(subset=["Data"])
+    if df.empty:
+        return {}
+    # Soma em float64 (as colunas podem estar em float32 ou em inteiros pequenos)
+    df = df.astype({name: float for name in numeric})
+    metrics = {name: (name, "sum") for name in numeric}
+    metrics["_rows"] = ("Data", "size")
+    result = aggregate(df, df["Data"].dt.to_period("M"), metrics)
+    return {str(month): totals for month, totals in result.to_dict(orient="index").items()}
+
+# Função para obter as somas mensais (meses do calendário, pela data) das colunas
+# numéricas de um conjunto de dados, indexadas por período e em ordem cronológica
+# (opcionalmente só algumas colunas). Os agregados são calculados uma vez e depois
+# mantidos a cada inclusão ou exclusão, então o custo depende do número de meses.
+def get_monthly(data_key, columns=None):
+    with dataset_entry(data_key) as entry:
+        if entry["monthly"] is None:
+            entry["monthly"] = monthly_totals(data_key, entry)
+        monthly = {month: dict(totals) for month, totals in entry["monthly"].items()}
+
+    if columns is None:
+        columns = [field["name"] for field in FIELDS[data_key] if field["type"] in NUMERIC_TYPES]
+    df = pd.DataFrame.from_dict(monthly, orient="index", dtype=float).reindex(columns=columns).fillna(0)
+    df.index = pd.PeriodIndex(df.index, freq="M")
+    return df.sort_index()
+
+# Função para formatar o rótulo de um período nos gráficos
+def bucket_label(period):
+    freq = period.freqstr
+    if freq.startswith("W"):
+        return f"Semana de {period.start_time:%d/%m/%Y}"
+    if freq.startswith("M"):
+        return f"{MESES[period.month - 1]}/{period.year}"
+    if freq.startswith("Q"):
+        return f"{period.quarter}º tri/{period.year}"
+    if freq.startswith("Y"):
+        return str(period.year)
+    return f"{period.start_time:%d/%m/%Y}"
+
+# Função para obter as somas das colunas numéricas de um conjunto de dados por período
+# do calendário (bucket: "Dia", "Semana", "Mês", "Trimestre" ou "Ano", ver BUCKETS),
+# agrupando pela data com períodos do pandas (to_period) em vez do campo Mês digitado.
+# O resultado é contínuo (períodos sem dados valem 0), em ordem cronológica e indexado
+# pelos rótulos dos períodos. Sem recorte de período, mês, trimestre e ano saem dos
+# agregados mensais mantidos incrementalmente; dia e semana agrupam o DataFrame tipado.
+def get_buckets(data_key, columns, bucket="Mês", start=None, end=None, months=()):
+    freq = BUCKETS[bucket]
+    if freq in ("M", "Q", "Y") and start is None and end is None and not months:
+        df = get_monthly(data_key, columns)
+        if freq != "M" and not df.empty:
+            df = df.groupby(df.index.asfreq(freq)).sum()
+    else:
+        df = get_frame(data_key, ["Data"] + list(columns), start, end, months).dropna(subset=["Data"])
+        df = df[list(columns)].astype(float).groupby(df["Data"].dt.to_period(freq)).sum()
+    if df.empty:
+        return pd.DataFrame(columns=list(columns), dtype=float)
+    df = df.reindex(pd.period_range(df.index.min(), df.index.max(), freq=freq), fill_value=0)
+    df.index = [bucket_label(period) for period in df.index]
+    return df
+
+# Função para obter a versão atual de um conjunto de dados
+def get_version(data_key):
+    with dataset_entry(data_key) as entry:
+        return entry["version"]
+
+# Função para obter a última versão conhecida de um conjunto de dados, sem consultar o
+# backend (None se o conjunto ainda não foi carregado)
+def known_version(data_key):
+    entry = get_store()["datasets"].get(data_key)
+    return entry["version"] if entry else None
+
+# Função para montar o relatório de memória dos conjuntos carregados no processo: linhas,
+# ano a partir do qual os registros estão em memória, se o DataFrame vem do instantâneo
+# mapeado (memória compartilhada entre os processos), memória do DataFrame e das leituras
+# parciais (só algumas colunas) e o tipo de cada coluna
+def memory_report():
+    store = get_store()
+    with store["lock"]:
+        entries = list(store["datasets"].items())
+    report = []
+    for data_key, entry in entries:
+        frame = entry["frame"]
+        partial = sum(df.memory_usage(deep=True).sum() for df in entry["frames"].values())
+        report.append({
+            "Conjunto": data_key,
+            "Versão": entry["version"],
+            "Linhas": len(frame) if frame is not None else None,
+            "Desde": (str(entry["since"]) if entry["since"] else "Todos os anos") if frame is not None else None,
+            "Mapeado": entry["mapped"],
+            "Memória (KB)": round(frame.memory_usage(deep=True).sum() / 1024, 1) if frame is not None else 0.0,
+            "Leituras parciais (KB)": round(partial / 1024, 1),
+            "Tipos": ", ".join(f"{name}: {dtype}" for name, dtype in frame.dtypes.items()) if frame is not None else "",
+        })
+    return pd.DataFrame(report)
+
+# Função para adicionar vários registros a um conjunto de dados em uma única escrita
+# no backend (uma transação no SQLite, um único acréscimo ao log nos arquivos). Um
+# registro com a chave natural de um registro existente (ver NATURAL_KEYS) o substitui,
+# mantendo o ID; entre registros com a mesma chave na mesma chamada, vale o último. A
+# trava entre processos garante que a escrita parte da versão mais recente, mesmo com
+# vários workers. Devolve as quantidades de registros incluídos, de registros
+# existentes atualizados e de registros descartados por repetirem a chave de outro
+# registro da mesma chamada.
+def append_records(data_key, records):
+    records = [convert_record(record, FIELDS[data_key]) for record in records]
+    if not records:
+        return 0, 0, 0
+    # Só os anos dos registros enviados (e o atual) precisam estar em memória
+    years = [record_year(record) for record in records if record_key(data_key, record) is not None]
+    since = min([year for year in years if year is not None] + [date.today().year])
+    store = get_store()
+    with dataset_entry(data_key, write=True) as entry:
+        entry_index(data_key, entry, since)
+        try:
+            with store["storage"].batch(data_key) as write:
+                frame, counts = write_records(data_key, entry, entry["frame"], records, write, {})
+        except Exception:
+            entry["token"] = None  # O backend desfez a escrita; a entrada é relida no próximo uso
+            raise
+        commit_entry(store, data_key, frame, added=[], removed=[])
+    return counts
+
+# Função para gravar uma parte de uma escrita de registros com chave natural (ver
+# append_records), com o índice da entrada já montado para os anos dos registros: cada
+# registro substitui o registro existente com a mesma chave (mantendo o ID) e, entre
+# registros com a mesma chave, vale o último. seen guarda as chaves já gravadas pelas
+# partes anteriores da mesma escrita (se a chave existia antes dela), para as contagens;
+# a parte é passada ao backend com write (ver batch), e os agregados e o índice da
+# entrada são atualizados na hora. Devolve o DataFrame com a parte e as quantidades de
+# registros incluídos, atualizados e descartados por repetirem uma chave da escrita.
+# (chamada com o lock da entrada adquirido)
+def write_records(data_key, entry, frame, records, write, seen):
+    index = entry["index"]
+    added, updated = {}, {}
+    inserted = changed = duplicates = 0
+    for record in records:
+        key = record_key(data_key, record)
+        if key is not None and key in seen:
+            duplicates += 1
+        elif key is not None:
+            seen[key] = key in index
+            if seen[key]:
+                changed += 1
+            else:
+                inserted += 1
+        else:
+            inserted += 1
+        if key is not None and key in index:
+            record[ID_COLUMN] = index[key]
+            updated[key] = record
+        elif key is not None and key in added:
+            record[ID_COLUMN] = added[key][ID_COLUMN]
+            added[key] = record
+        else:
+            record[ID_COLUMN] = uuid.uuid4().hex
+            added[key if key is not None else record[ID_COLUMN]] = record
+    added, updated = list(added.values()), list(updated.values())
+    replaced_ids = [record[ID_COLUMN] for record in updated]
+    removed = frame_records(frame[frame[ID_COLUMN].isin(replaced_ids)])
+    write(added, updated, [])
+    update_entry(data_key, entry, added + updated, removed)
+    return merge_frame(data_key, frame, added + updated, replaced_ids), (inserted, changed, duplicates)
+
+# Função para contar os registros de um conjunto que repetem a chave natural de outro
+# (gravados antes de a chave existir), entre os registros desde a data start
+def count_duplicates(data_key, start=None):
+    with dataset_entry(data_key) as entry:
+        index = entry_index(data_key, entry, pd.Timestamp(start).year if start is not None else None)
+        keyed = entry["frame"][NATURAL_KEYS[data_key]].notna().all(axis=1).sum()
+        return int(keyed) - len(index)
+
+# Função para remover de uma vez os registros repetidos de um conjunto (mesma chave
+# natural), mantendo o último de cada chave, que é o que os envios substituem.
+# Devolve a quantidade de registros removidos.
+def dedup_dataset(data_key):
+    store = get_store()
+    with dataset_entry(data_key, write=True) as entry:
+        kept = set(entry_index(data_key, entry).values())
+        frame = entry["frame"]
+        keyed = frame[NATURAL_KEYS[data_key]].notna().all(axis=1)
+        removed = frame_records(frame[keyed & ~frame[ID_COLUMN].isin(kept)])
+        if not removed:
+            return 0
+        dropped_ids = [record[ID_COLUMN] for record in removed]
+        store["storage"].apply(data_key, [], [], dropped_ids)
+        commit_entry(store, data_key, merge_frame(data_key, frame, (), dropped_ids), added=[], removed=removed)
+        return len(dropped_ids)
+
+# Fila de gravação compartilhada pelas sessões: os envios do formulário entram na fila e
+# uma thread os grava em segundo plano (write_loop), então o envio não espera pelo
+# backend. "pending" conta os registros de cada conjunto ainda não gravados; cada envio
+# tem um comprovante ("ticket"), guardado em "queued" até ser gravado e em "failed",
+# com o erro, se a gravação falhar. Ao encerrar o processo, a fila é esvaziada.
+@st.cache_resource
+def get_writer():
+    writer = {
+        "queue": queue.Queue(maxsize=WRITE_QUEUE_SIZE),
+        "condition": threading.Condition(),
+        "pending": {},
+        "queued": set(),
+        "failed": {},
+    }
+    threading.Thread(target=write_loop, args=(writer,), daemon=True).start()
+    atexit.register(wait_writes, writer, None, WRITE_FLUSH_TIMEOUT)
+    return writer
+
+# Função executada pela thread de gravação: espera um envio, junta os que chegaram nesse
+# meio tempo (até WRITE_BATCH_SIZE) e grava os de cada conjunto em uma única escrita
+# (append_records), em ordem de chegada
+def write_loop(writer):
+    while True:
+        batch = [writer["queue"].get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(writer["queue"].get_nowait())
+            except queue.Empty:
+                break
+        groups = {}
+        for data_key, records, ticket in batch:
+            group = groups.setdefault(data_key, {"records": [], "tickets": {}})
+            group["records"].extend(records)
+            group["tickets"][ticket] = len(records)
+        for data_key, group in groups.items():
+            try:
+                append_records(data_key, group["records"])
+            except Exception as error:
+                with writer["condition"]:
+                    for ticket, count in group["tickets"].items():
+                        writer["failed"][ticket] = (data_key, count, str(error))
+            with writer["condition"]:
+                writer["pending"][data_key] -= len(group["records"])
+                writer["queued"].difference_update(group["tickets"])
+                writer["condition"].notify_all()
+        for _ in batch:
+            writer["queue"].task_done()
+
+# Função para colocar registros na fila de gravação de um conjunto de dados. Devolve o
+# comprovante do envio, para quem enviou acompanhar a gravação (ver write_status).
+def enqueue_records(data_key, records):
+    writer = get_writer()
+    ticket = uuid.uuid4().hex
+    with writer["condition"]:
+        writer["pending"][data_key] = writer["pending"].get(data_key, 0) + len(records)
+        writer["queued"].add(ticket)
+    writer["queue"].put((data_key, records, ticket))
+    return ticket
+
+# Função para esperar até que os registros na fila de um conjunto (ou de todos, com
+# data_key None) estejam gravados. Devolve False se o tempo (timeout) acabar antes.
+def wait_writes(writer, data_key=None, timeout=None):
+    with writer["condition"]:
+        if data_key is None:
+            done = lambda: not any(writer["pending"].values())
+        else:
+            done = lambda: not writer["pending"].get(data_key)
+        return writer["condition"].wait_for(done, timeout)
+
+# Função para esperar a gravação dos registros na fila de um conjunto de dados
+def flush_writes(data_key=None, timeout=None):
+    return wait_writes(get_writer(), data_key, timeout)
+
+# Função para verificar a gravação de alguns envios pelos comprovantes: devolve as falhas
+# (conjunto, quantidade de registros e erro, removidas da fila de gravação) e os
+# comprovantes já concluídos, gravados ou não
+def write_status(tickets):
+    writer = get_writer()
+    with writer["condition"]:
+        failed = [writer["failed"].pop(ticket) for ticket in tickets if ticket in writer["failed"]]
+        done = [ticket for ticket in tickets if ticket not in writer["queued"]]
+    return failed, done
+
+# Função para importar um arquivo CSV ou XLSX para um conjunto de dados. O arquivo é
+# lido e validado em blocos, e as linhas válidas de cada bloco são gravadas na hora em
+# uma única escrita do backend (ver batch), que só vale se o arquivo todo for lido: em
+# memória ficam só o bloco atual e as chaves já importadas. As linhas inválidas são
+# ignoradas. Devolve as quantidades de registros incluídos, atualizados e de linhas
+# descartadas por repetirem a chave de outra linha do arquivo (ver append_records), os
+# erros por linha (no máximo IMPORT_MAX_ERRORS, com o número da linha na planilha) e o
+# total de erros.
+def import_file(data_key, file, file_name, mapping):
+    fields = FIELDS[data_key]
+    errors, total_errors, line = [], 0, 1
+    totals, seen = [0, 0, 0], {}
+    store = get_store()
+    with dataset_entry(data_key, write=True) as entry:
+        entry_index(data_key, entry)
+        frame = entry["frame"]
+        try:
+            with store["storage"].batch(data_key) as write:
+                for _, rows in read_import_chunks(file, file_name):
+                    records = []
+                    for row in rows:
+                        line += 1
+                        try:
+                            records.append(convert_record(import_row(row, fields, mapping), fields))
+                        except ValueError as error:
+                            total_errors += 1
+                            if len(errors) < IMPORT_MAX_ERRORS:
+                                errors.append({"Linha": line, "Erros": "; ".join(error.args[0])})
+                    if records:
+                        frame, counts = write_records(data_key, entry, frame, records, write, seen)
+                        totals = [total + count for total, count in zip(totals, counts)]
+        except Exception:
+            entry["token"] = None  # O backend desfez a escrita; a entrada é relida no próximo uso
+            raise
+        if frame is not entry["frame"]:
+            commit_entry(store, data_key, frame, added=[], removed=[])
+    inserted, updated, duplicates = totals
+    return inserted, updated, duplicates, errors, total_errors
+
+# Função para obter as chaves naturais que ficariam repetidas depois de uma alteração:
+# claims são as chaves dos registros incluídos e dos que mudaram de chave, e moving_ids
+# os IDs dos registros que deixam a chave que tinham (alterados ou apagados). A chave
+# está ocupada se algum registro que fica a tem; o índice responde na hora, e o
+# DataFrame só é percorrido quando o dono no índice é um dos que saem (troca de datas
+# ou registros repetidos anteriores à chave). (chamada com o lock da entrada adquirido)
+def key_conflicts(data_key, entry, claims, moving_ids):
+    index = entry_index(data_key, entry)
+    conflicts, seen, holders = [], set(), None
+    for key in claims:
+        if key in seen:
+            conflicts.append(key)
+            continue
+        seen.add(key)
+        holder = index.get(key)
+        if holder is not None and holder in moving_ids:
+            if holders is None:
+                frame = entry["frame"]
+                holders = {}
+                for record in frame_records(frame[~frame[ID_COLUMN].isin(moving_ids)][NATURAL_KEYS[data_key] + [ID_COLUMN]]):
+                    holders[record_key(data_key, record)] = record[ID_COLUMN]
+            holder = holders.get(key)
+        if holder is not None:
+            conflicts.append(key)
+    return conflicts
+
+# Função para aplicar de uma vez as alterações feitas na tabela editável: registros
+# incluídos, registros alterados (completos, com o ID) e IDs apagados. Tudo vai para o
+# backend em uma única escrita e os dados em memória são atualizados sem releitura.
+# Levanta ConflictError se algum registro alterado ou apagado já não existe e
+# DuplicateKeyError se um registro incluído ou alterado repetiria a chave natural de
+# outro (nada é gravado).
+def apply_changes(data_key, added=(), updated=(), deleted_ids=()):
+    fields = FIELDS[data_key]
+    added = [convert_record(record, fields) for record in added]
+    for record in added:
+        record[ID_COLUMN] = uuid.uuid4().hex
+    updated = [convert_record(record, fields) for record in updated]
+    deleted_ids = list(deleted_ids)
+    targets = set(record[ID_COLUMN] for record in updated) | set(deleted_ids)
+    store = get_store()
+    with dataset_entry(data_key, write=True) as entry:
+        frame = entry_frame(data_key, entry)
+        found = frame[ID_COLUMN].isin(targets)
+        if found.sum() != len(targets):
+            raise ConflictError(data_key)
+        removed = frame_records(frame[found])
+        old_keys = {record[ID_COLUMN]: record_key(data_key, record) for record in removed}
+        moved = [record for record in updated if record_key(data_key, record) != old_keys[record[ID_COLUMN]]]
+        claims = [key for key in (record_key(data_key, record) for record in added + moved) if key is not None]
+        conflicts = key_conflicts(data_key, entry, claims, {record[ID_COLUMN] for record in moved} | set(deleted_ids))
+        if conflicts:
+            raise DuplicateKeyError(conflicts)
+        store["storage"].apply(data_key, added, updated, deleted_ids)
+        frame = merge_frame(data_key, frame, added + updated, list(targets))
+        commit_entry(store, data_key, frame, added=added + updated, removed=removed)
+
+# Inicializa o estado de seleção (os dados são carregados sob demanda por get_frame)
 if "selected_network" not in st.session_state:
     st.session_state.selected_network = None
 
+# Fragmento reexecutado a cada WATCH_INTERVAL segundos que acompanha os envios desta
+# sessão ainda na fila de gravação e avisa, em qualquer tela, os que não foram gravados
+@st.fragment(run_every=WATCH_INTERVAL)
+def show_write_errors():
+    tickets = st.session_state.get("envios", [])
+    if tickets:
+        failed, done = write_status(tickets)
+        st.session_state.envios = [ticket for ticket in tickets if ticket not in done]
+        st.session_state.setdefault("falhas", []).extend(failed)
+    failures = st.session_state.get("falhas", [])
+    for data_key, count, error in failures:
+        st.error(f"{count} registro(s) enviado(s) para {data_key} NÃO foram gravados ({error}). Envie-os novamente.")
+    if failures and st.button("Dispensar avisos", key="dispensar_falhas"):
+        st.session_state.falhas = []
+        st.rerun()
+
 # Título da página
 st.title("Menus")
+show_write_errors()
 
 # Bloco suspenso para Redes Sociais
 with st.expander("Redes Sociais"):
@@ -73,8 +1820,6 @@ with st.expander("Redes Sociais"):
         st.session_state.selected_network = "Investimento em Mídia"
     if st.button("Custos"):
         st.session_state.selected_network = "Custos"
-    if "site_beirama_data" not in st.session_state:
-        st.session_state.site_beirama_data = load_data("site_beirama_data.csv")
     if st.button("Site Beirama"):
         st.session_state.selected_network = "Site Beirama"
     if st.button("Resultados Google"):
@@ -92,35 +1837,142 @@ with st.expander("Formulários Semanais"):
     if st.button("Investimentos em mídia (semanal)"):
         st.session_state.selected_network = "Investimento em Mídia (Semanal)"
 
-def show_instagram_graphs():
-    st.title("Gráficos do Instagram")
-    
-    if not st.session_state.instagram_data:
-        st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
-        return
-
-    df = pd.DataFrame(st.session_state.instagram_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
-
-    # Converte colunas para numéricas
-    df['Seguidores'] = pd.to_numeric(df['Seguidores'], errors='coerce')
-    df['Alcance'] = pd.to_numeric(df['Alcance'], errors='coerce')
-    df['Engajamento'] = pd.to_numeric(df['Engajamento'], errors='coerce')
-
-    # Remove linhas com valores inválidos
-    df.dropna(subset=['Seguidores', 'Alcance', 'Engajamento'], inplace=True)
+# Seletor global de período, aplicado a todas as tabelas e gráficos antes de os dados
+# serem montados (ver window)
+PERIODOS = ["Todo o período", "Últimos 30 dias", "Últimos 90 dias", "Últimos 12 meses", "Este ano", "Personalizado"]
+
+with st.sidebar:
+    st.header("Período")
+    periodo = st.selectbox("Período", PERIODOS, key="periodo", label_visibility="collapsed")
+    today = date.today()
+    start = end = None
+    if periodo == "Últimos 30 dias":
+        start = today - timedelta(days=29)
+    elif periodo == "Últimos 90 dias":
+        start = today - timedelta(days=89)
+    elif periodo == "Últimos 12 meses":
+        start = (pd.Timestamp(today) - pd.DateOffset(years=1)).date() + timedelta(days=1)
+    elif periodo == "Este ano":
+        start = date(today.year, 1, 1)
+    elif periodo == "Personalizado":
+        intervalo = st.date_input("Intervalo", value=(), format="DD/MM/YYYY", key="periodo_intervalo")
+        start = intervalo[0] if len(intervalo) > 0 else None
+        end = intervalo[1] if len(intervalo) > 1 else None
+    meses = st.multiselect("Meses", MESES, key="periodo_meses")
+    st.session_state.periodo_global = (start, end, tuple(meses))
+    st.header("Agrupamento")
+    st.selectbox("Agrupar gráficos por", list(BUCKETS), index=list(BUCKETS).index("Mês"), key="agrupamento")
+    with st.expander("Uso de memória"):
+        st.dataframe(memory_report(), hide_index=True)
+
+# Função para obter o período global selecionado: (início, fim, meses)
+def get_period():
+    return st.session_state.get("periodo_global", (None, None, ()))
+
+# Função para obter o agrupamento de tempo selecionado para os gráficos (ver BUCKETS)
+def get_bucket():
+    return st.session_state.get("agrupamento", "Mês")
+
+# Cache de figuras compartilhado pelas sessões, com descarte da menos usada (LRU).
+# A chave inclui a versão do conjunto de dados, então uma escrita invalida as figuras
+# dele automaticamente e, sem alterações, um rerun só faz uma consulta ao cache.
+@st.cache_resource
+def get_figure_cache():
+    return {"lock": threading.Lock(), "figures": OrderedDict()}
+
+# Função para obter as figuras de um gráfico do cache, montando-as com build(*args) só
+# quando a combinação (conjunto, versão, gráfico, parâmetros) ainda não está no cache.
+# A versão é lida antes de build buscar os dados, então uma escrita concorrente nunca
+# deixa figuras antigas guardadas com a versão nova.
+def cached_figures(data_key, chart_id, build, *args, params=()):
+    cache = get_figure_cache()
+    key = (data_key, get_version(data_key), chart_id, params)
+    with cache["lock"]:
+        if key in cache["figures"]:
+            cache["figures"].move_to_end(key)
+            return cache["figures"][key]
+
+    figures = build(*args)
+    with cache["lock"]:
+        cache["figures"][key] = figures
+        while len(cache["figures"]) > FIGURE_CACHE_SIZE:
+            cache["figures"].popitem(last=False)
+    return figures
+
+# Função para escolher os índices de no máximo budget pontos de uma série com o
+# algoritmo LTTB (Largest-Triangle-Three-Buckets): o primeiro e o último ponto são
+# mantidos e, em cada faixa intermediária, fica o ponto que forma o maior triângulo com
+# o ponto escolhido antes e a média da faixa seguinte, preservando picos e vales
+def lttb_indices(x, y, budget):
+    n = len(x)
+    if n <= budget or budget < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, budget - 1).astype(int)
+    selected = np.empty(budget, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+# Função para preparar uma série temporal (já recortada ao período) para um gráfico de
+# linha ou de área: acima de CHART_POINT_BUDGET pontos ela é reduzida com LTTB. Em um
+# período curto o gráfico volta a mostrar todos os pontos.
+def time_series(df, column):
+    if len(df) <= CHART_POINT_BUDGET:
+        return df
+    x = df['Data'].to_numpy(dtype="datetime64[ns]").astype("int64").astype(float)
+    return df.iloc[lttb_indices(x, df[column].to_numpy(dtype=float), CHART_POINT_BUDGET)]
+
+# Função para exibir o seletor de período dos gráficos, dentro do período global
+# (start/end), só quando a série passa de CHART_POINT_BUDGET pontos. Devolve o período
+# a usar nos gráficos.
+def chart_period(data_key, df, start=None, end=None):
+    dates = df['Data'].dropna()
+    if len(dates) <= CHART_POINT_BUDGET or dates.min() == dates.max():
+        return start, end
+    first, last = dates.min().date(), dates.max().date()
+    zoom_start, zoom_end = st.slider(
+        "Período dos gráficos (reduza para ver todos os pontos das linhas)",
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        format="DD/MM/YYYY",
+        key=f"{data_key}_periodo_graficos"
+    )
+    if (zoom_start, zoom_end) == (first, last):
+        return start, end
+    return zoom_start, zoom_end
+
+# Função para criar o traço de um gráfico de dispersão com n pontos: go.Scatter (SVG)
+# para poucos pontos e go.Scattergl (WebGL) acima de SCATTER_GL_THRESHOLD, com os
+# mesmos parâmetros de estilo e de hover
+def scatter_trace(n, **kwargs):
+    if n > SCATTER_GL_THRESHOLD:
+        return go.Scattergl(**kwargs)
+    return go.Scatter(**kwargs)
+
+# Função para montar os gráficos do Instagram
+def build_instagram_figures(start=None, end=None, months=(), bucket="Mês"):
+    # Remove linhas sem valores (os tipos já vêm convertidos de get_frame)
+    df = get_frame("instagram_data", columns=["Data", "Mês", "Seguidores", "Alcance", "Engajamento"], start=start, end=end, months=months).dropna(subset=['Seguidores', 'Alcance', 'Engajamento'])
 
     # Paleta de cores personalizada
     color_1 = "#FFA936"  # Laranja
     color_2 = "#12239E"  # Azul
 
     ### GRÁFICO DE LINHA ###
-    st.subheader("Crescimento de Seguidores ao Longo do Tempo")
     fig_line = go.Figure()
+    serie = time_series(df, 'Seguidores')
     fig_line.add_trace(go.Scatter(
-        x=df['Data'],
-        y=df['Seguidores'],
+        x=serie['Data'],
+        y=serie['Seguidores'],
         mode='lines+markers',
         name='Seguidores',
         line=dict(color=color_2, width=2.5),
@@ -134,43 +1986,31 @@ def show_instagram_graphs():
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_line)
 
      ### GRÁFICO DE BARRAS ###
-    st.subheader("Comparação do Alcance por Mês")
-    # Atualizando dinamicamente as categorias de meses com base nos dados disponíveis
-    unique_months = df['Mês'].dropna().unique()
-    sorted_months = sorted(unique_months, key=lambda x: [
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ].index(x))
-
-    df['Mês'] = pd.Categorical(df['Mês'], categories=sorted_months, ordered=True)
-    alcance_por_mes = df.groupby('Mês')['Alcance'].sum().reindex(sorted_months)
+    # Somas por período do calendário (ver get_buckets)
+    buckets = get_buckets("instagram_data", ['Alcance', 'Engajamento'], bucket, start, end, months)
+    alcance_por_periodo = buckets['Alcance']
 
     fig_bar = go.Figure()
     fig_bar.add_trace(go.Bar(
-        x=alcance_por_mes.index,
-        y=alcance_por_mes.values,
+        x=alcance_por_periodo.index,
+        y=alcance_por_periodo.values,
         name="Alcance",
         marker_color=color_1
     ))
     fig_bar.update_layout(
-        title="Alcance por Mês",
-        xaxis_title="Mês",
+        title=f"Alcance por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Alcance",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar)
 
     ### GRÁFICO DE PIZZA ###
-    st.subheader("Proporção de Engajamento")
-    total_engajamento = df['Engajamento'].sum()
-    proporcao_engajamento = (
-        df.groupby('Mês')['Engajamento'].sum() / total_engajamento
-    ).reindex(sorted_months)
+    total_engajamento = buckets['Engajamento'].sum()
+    proporcao_engajamento = buckets['Engajamento'] / total_engajamento
 
     fig_pizza = go.Figure(data=[go.Pie(
         labels=proporcao_engajamento.index,
@@ -187,7 +2027,7 @@ def show_instagram_graphs():
 
     fig_pizza.update_layout(
         title=dict(
-            text="Proporção de Engajamento por Mês",
+            text=f"Proporção de Engajamento por {bucket}",
             font=dict(size=18, color="#12239E"),  # Título estilizado com a cor da empresa
             x=0.5  # Centraliza o título
         ),
@@ -202,74 +2042,72 @@ def show_instagram_graphs():
         )
     )
 
-    st.plotly_chart(fig_pizza)
-
-def show_facebook_graphs():
-    st.title("Gráficos do Facebook")
+    return fig_line, fig_bar, fig_pizza
 
-    if not st.session_state.facebook_data:
+def show_instagram_graphs():
+    st.title("Gráficos do Instagram")
+    
+    start, end, months = get_period()
+    bucket = get_bucket()
+    df = get_frame("instagram_data", columns=["Data", "Mês", "Seguidores", "Alcance", "Engajamento"], start=start, end=end, months=months)
+    if df.empty:
         st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
         return
 
-    df = pd.DataFrame(st.session_state.facebook_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
+    start, end = chart_period("instagram_data", df, start, end)
+    fig_line, fig_bar, fig_pizza = cached_figures("instagram_data", "instagram", build_instagram_figures, start, end, months, bucket, params=(start, end, months, bucket))
+
+    st.subheader("Crescimento de Seguidores ao Longo do Tempo")
+    st.plotly_chart(fig_line)
+
+    st.subheader(f"Comparação do Alcance por {bucket}")
+    st.plotly_chart(fig_bar)
 
-    # Converte colunas para numéricas
-    df['Cliques'] = pd.to_numeric(df['Cliques'], errors='coerce')
-    df['Engajamento'] = pd.to_numeric(df['Engajamento'], errors='coerce')
-    df['Alcance'] = pd.to_numeric(df['Alcance'], errors='coerce')
+    st.subheader("Proporção de Engajamento")
+    st.plotly_chart(fig_pizza)
 
-    # Remove linhas com valores inválidos
-    df.dropna(subset=['Cliques', 'Engajamento', 'Alcance'], inplace=True)
+# Função para montar os gráficos do Facebook
+def build_facebook_figures(start=None, end=None, months=(), bucket="Mês"):
+    # Remove linhas sem valores (os tipos já vêm convertidos de get_frame)
+    df = get_frame("facebook_data", columns=["Data", "Mês", "Cliques", "Engajamento", "Alcance"], start=start, end=end, months=months).dropna(subset=['Cliques', 'Engajamento', 'Alcance'])
 
     # Paleta de cores personalizada
     color_1 = "#FFA936"  # Laranja
     color_2 = "#12239E"  # Azul
 
     ### GRÁFICO DE BARRAS EMPILHADAS ###
-    st.subheader("Cliques e Engajamento por Mês")
-
-    # Atualizar dinamicamente os meses com base nos dados disponíveis
-    unique_months = df['Mês'].dropna().unique()
-    sorted_months = sorted(unique_months, key=lambda x: [
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ].index(x))
-
-    df['Mês'] = pd.Categorical(df['Mês'], categories=sorted_months, ordered=True)
-    cliques_por_mes = df.groupby('Mês')['Cliques'].sum().reindex(sorted_months)
-    engajamento_por_mes = df.groupby('Mês')['Engajamento'].sum().reindex(sorted_months)
+    # Somas por período do calendário (ver get_buckets)
+    buckets = get_buckets("facebook_data", ['Cliques', 'Engajamento'], bucket, start, end, months)
+    cliques_por_periodo = buckets['Cliques']
+    engajamento_por_periodo = buckets['Engajamento']
 
     fig_bar_stacked = go.Figure()
     fig_bar_stacked.add_trace(go.Bar(
-        x=cliques_por_mes.index,
-        y=cliques_por_mes.values,
+        x=cliques_por_periodo.index,
+        y=cliques_por_periodo.values,
         name="Cliques",
         marker_color=color_1
     ))
     fig_bar_stacked.add_trace(go.Bar(
-        x=engajamento_por_mes.index,
-        y=engajamento_por_mes.values,
+        x=engajamento_por_periodo.index,
+        y=engajamento_por_periodo.values,
         name="Engajamento",
         marker_color=color_2
     ))
     fig_bar_stacked.update_layout(
         barmode="stack",
-        title="Cliques e Engajamento Empilhados por Mês",
-        xaxis_title="Mês",
+        title=f"Cliques e Engajamento Empilhados por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Valores",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar_stacked)
-
 
     ### GRÁFICO DE DISPERSÃO ###
-    st.subheader("Relação entre Alcance e Engajamento")
     fig_scatter = go.Figure()
-    fig_scatter.add_trace(go.Scatter(
+    fig_scatter.add_trace(scatter_trace(
+        len(df),
         x=df['Alcance'],
         y=df['Engajamento'],
         mode='markers',
@@ -283,14 +2121,13 @@ def show_facebook_graphs():
         hovermode="closest",
         template="plotly_white"
     )
-    st.plotly_chart(fig_scatter)
 
     ### GRÁFICO DE LINHA ###
-    st.subheader("Cliques ao Longo do Tempo")
     fig_line = go.Figure()
+    serie = time_series(df, 'Cliques')
     fig_line.add_trace(go.Scatter(
-        x=df['Data'],
-        y=df['Cliques'],
+        x=serie['Data'],
+        y=serie['Cliques'],
         mode='lines+markers',
         name='Cliques',
         line=dict(color=color_1, width=2.5),
@@ -304,73 +2141,75 @@ def show_facebook_graphs():
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_line)
 
-def show_linkedin_graphs():
-    st.title("Gráficos do LinkedIn")
-    
-    if not st.session_state.linkedin_data:
+    return fig_bar_stacked, fig_scatter, fig_line
+
+def show_facebook_graphs():
+    st.title("Gráficos do Facebook")
+
+    start, end, months = get_period()
+    bucket = get_bucket()
+    df = get_frame("facebook_data", columns=["Data", "Mês", "Cliques", "Engajamento", "Alcance"], start=start, end=end, months=months)
+    if df.empty:
         st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
         return
 
-    df = pd.DataFrame(st.session_state.linkedin_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
+    start, end = chart_period("facebook_data", df, start, end)
+    fig_bar_stacked, fig_scatter, fig_line = cached_figures("facebook_data", "facebook", build_facebook_figures, start, end, months, bucket, params=(start, end, months, bucket))
 
-    # Converte colunas para numéricas
-    df['Alcance'] = pd.to_numeric(df['Alcance'], errors='coerce')
-    df['Cliques'] = pd.to_numeric(df['Cliques'], errors='coerce')
-    df['Engajamento'] = pd.to_numeric(df['Engajamento'], errors='coerce')
-    df['Seguidores'] = pd.to_numeric(df['Seguidores'], errors='coerce')
+    st.subheader(f"Cliques e Engajamento por {bucket}")
+    st.plotly_chart(fig_bar_stacked)
 
-    # Remove linhas com valores inválidos
-    df.dropna(subset=['Alcance', 'Cliques', 'Engajamento', 'Seguidores'], inplace=True)
+    st.subheader("Relação entre Alcance e Engajamento")
+    st.plotly_chart(fig_scatter)
+
+    st.subheader("Cliques ao Longo do Tempo")
+    st.plotly_chart(fig_line)
+
+# Função para montar os gráficos do LinkedIn
+def build_linkedin_figures(start=None, end=None, months=(), bucket="Mês"):
+    # Remove linhas sem valores (os tipos já vêm convertidos de get_frame)
+    df = get_frame("linkedin_data", columns=["Data", "Mês", "Alcance", "Cliques", "Engajamento", "Seguidores"], start=start, end=end, months=months).dropna(subset=['Alcance', 'Cliques', 'Engajamento', 'Seguidores'])
 
     # Paleta de cores personalizada
     color_1 = "#FFA936"  # Laranja
     color_2 = "#12239E"  # Azul
 
     ### GRÁFICO DE BARRAS ###
-    st.subheader("Comparação de Alcance e Cliques por Mês")
-    df['Mês'] = pd.Categorical(df['Mês'], categories=[
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ], ordered=True)
-
-    alcance_por_mes = df.groupby('Mês')['Alcance'].sum().reindex(df['Mês'].cat.categories)
-    cliques_por_mes = df.groupby('Mês')['Cliques'].sum().reindex(df['Mês'].cat.categories)
+    buckets = get_buckets("linkedin_data", ['Alcance', 'Cliques'], bucket, start, end, months)
+    alcance_por_periodo = buckets['Alcance']
+    cliques_por_periodo = buckets['Cliques']
 
     fig_bar = go.Figure()
     fig_bar.add_trace(go.Bar(
-        x=alcance_por_mes.index,
-        y=alcance_por_mes.values,
+        x=alcance_por_periodo.index,
+        y=alcance_por_periodo.values,
         name="Alcance",
         marker_color=color_1
     ))
     fig_bar.add_trace(go.Bar(
-        x=cliques_por_mes.index,
-        y=cliques_por_mes.values,
+        x=cliques_por_periodo.index,
+        y=cliques_por_periodo.values,
         name="Cliques",
         marker_color=color_2
     ))
     fig_bar.update_layout(
         barmode="group",
-        title="Comparação de Alcance e Cliques por Mês",
-        xaxis_title="Mês",
+        title=f"Comparação de Alcance e Cliques por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Valores",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar)
 
     ### GRÁFICO DE ÁREA ###
-    st.subheader("Crescimento Acumulado de Seguidores")
-    df['Seguidores Acumulados'] = df['Seguidores'].cumsum()
+    df['Seguidores Acumulados'] = df['Seguidores'].astype(float).cumsum()
     fig_area = go.Figure()
+    serie = time_series(df, 'Seguidores Acumulados')
     fig_area.add_trace(go.Scatter(
-        x=df['Data'],
-        y=df['Seguidores Acumulados'],
+        x=serie['Data'],
+        y=serie['Seguidores Acumulados'],
         mode='lines',
         fill='tozeroy',
         line=dict(color=color_2, width=2),
@@ -384,12 +2223,11 @@ def show_linkedin_graphs():
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_area)
 
     ### GRÁFICO DE DISPERSÃO ###
-    st.subheader("Relação entre Cliques e Engajamento")
     fig_scatter = go.Figure()
-    fig_scatter.add_trace(go.Scatter(
+    fig_scatter.add_trace(scatter_trace(
+        len(df),
         x=df['Cliques'],
         y=df['Engajamento'],
         mode='markers',
@@ -403,38 +2241,46 @@ def show_linkedin_graphs():
         hovermode="closest",
         template="plotly_white"
     )
-    st.plotly_chart(fig_scatter)
 
-def show_email_mkt_graphs():
-    st.title("Gráficos do E-mail MKT")
+    return fig_bar, fig_area, fig_scatter
+
+def show_linkedin_graphs():
+    st.title("Gráficos do LinkedIn")
     
-    if not st.session_state.email_mkt_data:
+    start, end, months = get_period()
+    bucket = get_bucket()
+    df = get_frame("linkedin_data", columns=["Data", "Mês", "Alcance", "Cliques", "Engajamento", "Seguidores"], start=start, end=end, months=months)
+    if df.empty:
         st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
         return
 
-    df = pd.DataFrame(st.session_state.email_mkt_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
+    start, end = chart_period("linkedin_data", df, start, end)
+    fig_bar, fig_area, fig_scatter = cached_figures("linkedin_data", "linkedin", build_linkedin_figures, start, end, months, bucket, params=(start, end, months, bucket))
+
+    st.subheader(f"Comparação de Alcance e Cliques por {bucket}")
+    st.plotly_chart(fig_bar)
+
+    st.subheader("Crescimento Acumulado de Seguidores")
+    st.plotly_chart(fig_area)
 
-    # Converte colunas para numéricas
-    df['Taxa de Abertura'] = pd.to_numeric(df['Taxa de Abertura'], errors='coerce')
-    df['Cliques'] = pd.to_numeric(df['Cliques'], errors='coerce')
-    df['Descadastro'] = pd.to_numeric(df['Descadastro'], errors='coerce')
-    df['Receita Gerada'] = pd.to_numeric(df['Receita Gerada'], errors='coerce')
+    st.subheader("Relação entre Cliques e Engajamento")
+    st.plotly_chart(fig_scatter)
 
-    # Remove linhas com valores inválidos
-    df.dropna(subset=['Taxa de Abertura', 'Cliques', 'Descadastro'], inplace=True)
+# Função para montar os gráficos do E-mail MKT
+def build_email_mkt_figures(start=None, end=None, months=(), bucket="Mês"):
+    # Remove linhas sem valores (os tipos já vêm convertidos de get_frame)
+    df = get_frame("email_mkt_data", columns=["Data", "Mês", "Taxa de Abertura", "Cliques", "Descadastro"], start=start, end=end, months=months).dropna(subset=['Taxa de Abertura', 'Cliques', 'Descadastro'])
 
     # Paleta de cores personalizada
     color_1 = "#FFA936"  # Laranja
     color_2 = "#12239E"  # Azul
 
     ### GRÁFICO DE LINHA ###
-    st.subheader("Taxa de Abertura ao Longo do Tempo")
     fig_line = go.Figure()
+    serie = time_series(df, 'Taxa de Abertura')
     fig_line.add_trace(go.Scatter(
-        x=df['Data'],
-        y=df['Taxa de Abertura'],
+        x=serie['Data'],
+        y=serie['Taxa de Abertura'],
         mode='lines+markers',
         name='Taxa de Abertura',
         line=dict(color=color_2, width=2.5),
@@ -448,45 +2294,37 @@ def show_email_mkt_graphs():
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_line)
 
     ### GRÁFICO DE BARRAS ###
-    st.subheader("Comparação de Cliques e Descadastros por Mês")
-    df['Mês'] = pd.Categorical(df['Mês'], categories=[
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ], ordered=True)
-
-    cliques_por_mes = df.groupby('Mês')['Cliques'].sum().reindex(df['Mês'].cat.categories)
-    descadastros_por_mes = df.groupby('Mês')['Descadastro'].sum().reindex(df['Mês'].cat.categories)
+    buckets = get_buckets("email_mkt_data", ['Cliques', 'Descadastro'], bucket, start, end, months)
+    cliques_por_periodo = buckets['Cliques']
+    descadastros_por_periodo = buckets['Descadastro']
 
     fig_bar = go.Figure()
     fig_bar.add_trace(go.Bar(
-        x=cliques_por_mes.index,
-        y=cliques_por_mes.values,
+        x=cliques_por_periodo.index,
+        y=cliques_por_periodo.values,
         name="Cliques",
         marker_color=color_1
     ))
     fig_bar.add_trace(go.Bar(
-        x=descadastros_por_mes.index,
-        y=descadastros_por_mes.values,
+        x=descadastros_por_periodo.index,
+        y=descadastros_por_periodo.values,
         name="Descadastros",
         marker_color=color_2
     ))
     fig_bar.update_layout(
         barmode="group",
-        title="Cliques e Descadastros por Mês",
-        xaxis_title="Mês",
+        title=f"Cliques e Descadastros por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Valores",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar)
 
     ### GRÁFICO DE ROSCA ###
-    st.subheader("Distribuição Percentual de Cliques e Descadastros")
-    total_cliques_descadastros = df[['Cliques', 'Descadastro']].sum()
+    total_cliques_descadastros = df[['Cliques', 'Descadastro']].astype(float).sum()
     fig_donut = go.Figure(data=[go.Pie(
         labels=total_cliques_descadastros.index,
         values=total_cliques_descadastros.values,
@@ -516,37 +2354,46 @@ def show_email_mkt_graphs():
             yanchor="bottom", y=-0.2, xanchor="center", x=0.5
         )
     )
-    st.plotly_chart(fig_donut)
 
-def show_youtube_graphs():
-    st.title("Gráficos do YouTube Orgânico")
+    return fig_line, fig_bar, fig_donut
+
+def show_email_mkt_graphs():
+    st.title("Gráficos do E-mail MKT")
     
-    if not st.session_state.youtube_data:
+    start, end, months = get_period()
+    bucket = get_bucket()
+    df = get_frame("email_mkt_data", columns=["Data", "Mês", "Taxa de Abertura", "Cliques", "Descadastro"], start=start, end=end, months=months)
+    if df.empty:
         st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
         return
 
-    df = pd.DataFrame(st.session_state.youtube_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
+    start, end = chart_period("email_mkt_data", df, start, end)
+    fig_line, fig_bar, fig_donut = cached_figures("email_mkt_data", "email_mkt", build_email_mkt_figures, start, end, months, bucket, params=(start, end, months, bucket))
 
-    # Converte colunas para numéricas
-    df['Visualizações'] = pd.to_numeric(df['Visualizações'], errors='coerce')
-    df['Duração Média da Visualização'] = pd.to_numeric(df['Duração Média da Visualização'], errors='coerce')
-    df['Inscritos'] = pd.to_numeric(df['Inscritos'], errors='coerce')
+    st.subheader("Taxa de Abertura ao Longo do Tempo")
+    st.plotly_chart(fig_line)
 
-    # Remove linhas com valores inválidos
-    df.dropna(subset=['Visualizações', 'Duração Média da Visualização', 'Inscritos'], inplace=True)
+    st.subheader(f"Comparação de Cliques e Descadastros por {bucket}")
+    st.plotly_chart(fig_bar)
+
+    st.subheader("Distribuição Percentual de Cliques e Descadastros")
+    st.plotly_chart(fig_donut)
+
+# Função para montar os gráficos do YouTube Orgânico
+def build_youtube_figures(start=None, end=None, months=(), bucket="Mês"):
+    # Remove linhas sem valores (os tipos já vêm convertidos de get_frame)
+    df = get_frame("youtube_data", columns=["Data", "Mês", "Visualizações", "Duração Média da Visualização", "Inscritos"], start=start, end=end, months=months).dropna(subset=['Visualizações', 'Duração Média da Visualização', 'Inscritos'])
 
     # Paleta de cores personalizada
     color_1 = "#FFA936"  # Laranja
     color_2 = "#12239E"  # Azul
 
     ### GRÁFICO DE LINHA ###
-    st.subheader("Crescimento de Inscritos ao Longo do Tempo")
     fig_line = go.Figure()
+    serie = time_series(df, 'Inscritos')
     fig_line.add_trace(go.Scatter(
-        x=df['Data'],
-        y=df['Inscritos'],
+        x=serie['Data'],
+        y=serie['Inscritos'],
         mode='lines+markers',
         name='Inscritos',
         line=dict(color=color_2, width=2.5),
@@ -560,37 +2407,30 @@ def show_youtube_graphs():
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_line)
 
     ### GRÁFICO DE BARRAS ###
-    st.subheader("Visualizações por Mês")
-    df['Mês'] = pd.Categorical(df['Mês'], categories=[
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ], ordered=True)
-    visualizacoes_por_mes = df.groupby('Mês')['Visualizações'].sum().reindex(df['Mês'].cat.categories)
+    visualizacoes_por_periodo = get_buckets("youtube_data", ['Visualizações'], bucket, start, end, months)['Visualizações']
     
     fig_bar = go.Figure()
     fig_bar.add_trace(go.Bar(
-        x=visualizacoes_por_mes.index,
-        y=visualizacoes_por_mes.values,
+        x=visualizacoes_por_periodo.index,
+        y=visualizacoes_por_periodo.values,
         name="Visualizações",
         marker_color=color_1
     ))
     fig_bar.update_layout(
-        title="Visualizações por Mês",
-        xaxis_title="Mês",
+        title=f"Visualizações por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Visualizações",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar)
 
     ### GRÁFICO DE DISPERSÃO ###
-    st.subheader("Relação entre Duração Média e Visualizações")
     fig_scatter = go.Figure()
-    fig_scatter.add_trace(go.Scatter(
+    fig_scatter.add_trace(scatter_trace(
+        len(df),
         x=df['Duração Média da Visualização'],
         y=df['Visualizações'],
         mode='markers',
@@ -604,75 +2444,68 @@ def show_youtube_graphs():
         hovermode="closest",
         template="plotly_white"
     )
-    st.plotly_chart(fig_scatter)
 
-def show_investimento_graficos():
-    st.title("Gráficos de Investimento em Mídia")
+    return fig_line, fig_bar, fig_scatter
+
+def show_youtube_graphs():
+    st.title("Gráficos do YouTube Orgânico")
     
-    if not st.session_state.midia_investimento_data:
+    start, end, months = get_period()
+    bucket = get_bucket()
+    df = get_frame("youtube_data", columns=["Data", "Mês", "Visualizações", "Duração Média da Visualização", "Inscritos"], start=start, end=end, months=months)
+    if df.empty:
         st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
         return
 
-    df = pd.DataFrame(st.session_state.midia_investimento_data)
-    df['Data'] = pd.to_datetime(df['Data'])
-    df.sort_values('Data', inplace=True)
+    start, end = chart_period("youtube_data", df, start, end)
+    fig_line, fig_bar, fig_scatter = cached_figures("youtube_data", "youtube", build_youtube_figures, start, end, months, bucket, params=(start, end, months, bucket))
 
-    # Converte colunas para numéricas
-    cols_to_numeric = [
-        "Google(Display)", "Google(Search)", "Google(Youtube)", 
-        "Meta Ads", "LinkedIn ADS"
-    ]
-    for col in cols_to_numeric:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    # Remove linhas com valores inválidos
-    df.dropna(subset=cols_to_numeric, inplace=True)
+    st.subheader("Crescimento de Inscritos ao Longo do Tempo")
+    st.plotly_chart(fig_line)
 
-    # Adiciona uma coluna para o total de gastos
-    df['Total Gastos'] = df[cols_to_numeric].sum(axis=1)
+    st.subheader(f"Visualizações por {bucket}")
+    st.plotly_chart(fig_bar)
 
-    # Agrupa os dados por mês
-    df['Mês'] = pd.Categorical(df['Mês'], categories=[
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ], ordered=True)
+    st.subheader("Relação entre Duração Média e Visualizações")
+    st.plotly_chart(fig_scatter)
 
-    total_por_mes = df.groupby('Mês')['Total Gastos'].sum().reindex(df['Mês'].cat.categories)
+# Função para montar os gráficos de Investimento em Mídia (mensal ou semanal) a partir
+# das somas por período
+def build_investimento_figures(data_key, columns, start=None, end=None, months=(), bucket="Mês"):
+    # Total de gastos por período
+    buckets = get_buckets(data_key, columns, bucket, start, end, months)
+    total_por_periodo = buckets.sum(axis=1)
 
     # Paleta de cores personalizada
     color_total = "#FF5733"  # Vermelho para Total
 
     ### GRÁFICO DE BARRAS ###
-    st.subheader("Total de Gastos por Mês")
     fig_bar_total = go.Figure()
     fig_bar_total.add_trace(go.Bar(
-        x=total_por_mes.index,
-        y=total_por_mes.values,
+        x=total_por_periodo.index,
+        y=total_por_periodo.values,
         name="Total de Gastos",
         marker_color=color_total
     ))
     fig_bar_total.update_layout(
-        title="Total de Gastos por Mês",
-        xaxis_title="Mês",
+        title=f"Total de Gastos por {bucket}",
+        xaxis_title=bucket,
         yaxis_title="Total (R$)",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
-    st.plotly_chart(fig_bar_total)
 
-    # Mostra o total acumulado
-    total_acumulado = total_por_mes.sum()
-    st.markdown(f"### Total Geral de Investimentos: **R$ {total_acumulado:,.2f}**")
+    # Total acumulado
+    total_acumulado = total_por_periodo.sum()
 
     ### GRÁFICO DE LINHAS ###
-    st.subheader("Distribuição de Gastos por Mídia ao Longo do Tempo")
     fig_line = go.Figure()
-    for col in cols_to_numeric:
-        gastos_por_mes = df.groupby('Mês')[col].sum().reindex(df['Mês'].cat.categories)
+    for col in buckets.columns:
+        gastos_por_periodo = buckets[col]
         fig_line.add_trace(go.Scatter(
-            x=gastos_por_mes.index,
-            y=gastos_por_mes.values,
+            x=gastos_por_periodo.index,
+            y=gastos_por_periodo.values,
             mode='lines+markers',
             name=col,
             line=dict(width=2.5),
@@ -680,25 +2513,298 @@ def show_investimento_graficos():
         ))
     fig_line.update_layout(
         title="Gastos por Tipo de Mídia",
-        xaxis_title="Mês",
+        xaxis_title=bucket,
         yaxis_title="Gastos (R$)",
         xaxis=dict(tickangle=-45),
         hovermode="x unified",
         template="plotly_white"
     )
+
+    return fig_bar_total, total_acumulado, fig_line
+
+def show_investimento_graficos(data_key="midia_investimento_data"):
+    st.title("Gráficos de Investimento em Mídia")
+    
+    # Colunas de gastos por mídia
+    cols_to_numeric = [
+        "Google(Display)", "Google(Search)", "Google(Youtube)", 
+        "Meta Ads", "LinkedIn ADS"
+    ]
+
+    # Somas por período (sem recorte, vêm dos agregados mensais mantidos
+    # incrementalmente e não é preciso ler os registros)
+    start, end, months = get_period()
+    bucket = get_bucket()
+    buckets = get_buckets(data_key, cols_to_numeric, bucket, start, end, months)
+    if buckets.empty:
+        st.info("Nenhum dado disponível para gerar gráficos. Preencha o formulário primeiro.")
+        return
+
+    fig_bar_total, total_acumulado, fig_line = cached_figures(
+        data_key, "investimento", build_investimento_figures, data_key, cols_to_numeric, start, end, months, bucket,
+        params=(start, end, months, bucket)
+    )
+
+    st.subheader(f"Total de Gastos por {bucket}")
+    st.plotly_chart(fig_bar_total)
+
+    # Mostra o total acumulado
+    st.markdown(f"### Total Geral de Investimentos: **R$ {total_acumulado:,.2f}**")
+
+    st.subheader("Distribuição de Gastos por Mídia ao Longo do Tempo")
     st.plotly_chart(fig_line)
 
 
+# Cache dos arquivos exportados, compartilhado pelas sessões e indexado pela versão do
+# conjunto de dados (como o cache de figuras)
+@st.cache_resource
+def get_export_cache():
+    return {"lock": threading.Lock(), "files": OrderedDict()}
+
+# Função para obter um arquivo de exportação do cache, gerando-o com build(data_key,
+# *args) só na primeira vez para a versão atual do conjunto de dados
+def cached_export(data_key, export_format, build, *args):
+    cache = get_export_cache()
+    key = (data_key, get_version(data_key), export_format, args)
+    with cache["lock"]:
+        if key in cache["files"]:
+            cache["files"].move_to_end(key)
+            return cache["files"][key]
+
+    content = build(data_key, *args)
+    with cache["lock"]:
+        cache["files"][key] = content
+        while len(cache["files"]) > EXPORT_CACHE_SIZE:
+            cache["files"].popitem(last=False)
+    return content
+
+# Função para gerar o arquivo Excel de um conjunto de dados. As linhas são gravadas
+# em ordem no modo constant_memory do xlsxwriter, que mantém só uma linha em memória
+# em vez da planilha inteira.
+def build_excel(data_key, title):
+    df = get_frame(data_key).drop(columns=[ID_COLUMN], errors="ignore")
+    buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True})
+    worksheet = workbook.add_worksheet(title[:31])
+    date_format = workbook.add_format({"num_format": "dd/mm/yyyy"})
+    worksheet.write_row(0, 0, df.columns)
+    for row, values in enumerate(df.itertuples(index=False), start=1):
+        for col, value in enumerate(values):
+            if pd.isna(value):
+                continue
+            if isinstance(value, pd.Timestamp):
+                worksheet.write_datetime(row, col, value.to_pydatetime(), date_format)
+            else:
+                worksheet.write(row, col, value)
+    workbook.close()
+    return buffer.getvalue()
+
+# Função para gerar o arquivo CSV de um conjunto de dados
+def build_csv(data_key):
+    df = get_frame(data_key).drop(columns=[ID_COLUMN], errors="ignore")
+    return df.to_csv(index=False).encode("utf-8")
+
+# Função para configurar as colunas da tabela editável de acordo com os campos
+def editor_columns(fields):
+    config = {}
+    for field in fields:
+        name = field["name"]
+        if field["type"] == "date":
+            config[name] = st.column_config.DateColumn(name, format="DD/MM/YYYY")
+        elif field["type"] == "select":
+            config[name] = st.column_config.SelectboxColumn(name, options=field["options"])
+        elif field["type"] in NUMERIC_TYPES:
+            config[name] = st.column_config.NumberColumn(name)
+        else:
+            config[name] = st.column_config.TextColumn(name)
+    return config
+
+# Função chamada ao salvar a tabela editável (antes do rerun do fragmento da tabela).
+# Valida as alterações da página (ids são os IDs das linhas exibidas) e grava todas de
+# uma vez com apply_changes; o resultado é exibido por show_table no rerun.
+def save_table_edits(data_key, editor_key, ids, offset):
+    changes = st.session_state[editor_key]
+    fields = FIELDS[data_key]
+    mapping = {field["name"]: field["name"] for field in fields}
+    deleted_ids = [ids[position] for position in changes["deleted_rows"]]
+    frame = get_frame(data_key)
+    edited_ids = [ids[int(position)] for position in changes["edited_rows"]]
+    records = {record[ID_COLUMN]: record for record in frame_records(frame[frame[ID_COLUMN].isin(edited_ids)])}
+    added, updated, errors = [], [], []
+
+    for position, values in changes["edited_rows"].items():
+        record_id = ids[int(position)]
+        if record_id in deleted_ids:
+            continue
+        if record_id not in records:
+            st.session_state[f"{data_key}_edicao"] = ("warning", "Um dos registros editados foi apagado por outro usuário.")
+            return
+        try:
+            record = import_row({**records[record_id], **values}, fields, mapping)
+        except ValueError as error:
+            errors.append(f"Linha {offset + int(position) + 1}: {'; '.join(error.args[0])}")
+        else:
+            record[ID_COLUMN] = record_id
+            updated.append(record)
+
+    for i, values in enumerate(changes["added_rows"]):
+        try:
+            added.append(import_row(values, fields, mapping))
+        except ValueError as error:
+            errors.append(f"Nova linha {i + 1}: {'; '.join(error.args[0])}")
+
+    if errors:
+        st.session_state[f"{data_key}_edicao"] = ("error", "Nada foi salvo. Corrija os valores: " + " | ".join(errors))
+        return
+    try:
+        apply_changes(data_key, added, updated, deleted_ids)
+    except DuplicateKeyError as error:
+        keys = ", ".join(" / ".join(key) for key in error.args[0])
+        st.session_state[f"{data_key}_edicao"] = ("error", f"Nada foi salvo. Já existe um registro com {' / '.join(NATURAL_KEYS[data_key])} {keys}.")
+    except ConflictError:
+        st.session_state[f"{data_key}_edicao"] = ("warning", "Um dos registros foi apagado por outro usuário.")
+    else:
+        st.session_state[f"{data_key}_edicao"] = (
+            "success",
+            f"Alterações salvas: {len(added)} incluídos, {len(updated)} alterados, {len(deleted_ids)} apagados."
+        )
+
+# Fragmento reexecutado a cada WATCH_INTERVAL segundos que verifica se o conjunto exibido
+# foi alterado depois que a sessão o montou (por outra sessão ou, via watch_store, por
+# outro processo). Nos gráficos a página é atualizada na hora; na tabela, para não
+# descartar edições em andamento, aparece um aviso com o botão de atualizar.
+@st.fragment(run_every=WATCH_INTERVAL)
+def watch_dataset(data_key, automatic):
+    if known_version(data_key) == st.session_state.get(f"{data_key}_versao"):
+        return
+    if automatic:
+        st.rerun()
+    st.info("Os dados foram alterados por outro usuário.")
+    if st.button("Atualizar", key=f"{data_key}_atualizar"):
+        st.rerun()
+
+# Fragmento da aba Tabela: filtros, paginação e o salvamento da tabela editável
+# reexecutam só a tabela, não a página inteira
+@st.fragment
+def show_table(data_key, fields, title):
+    st.title(f"Tabela de Dados de {title}")
+    # Versão exibida (as gravações da própria tabela não contam como alteração de outro
+    # usuário para watch_dataset)
+    st.session_state[f"{data_key}_versao"] = get_version(data_key)
+    # Só os anos a partir do início do período global são lidos
+    start, end, months = get_period()
+    frame = get_frame(data_key, start=start)
+    if not frame.empty:
+        # Período global, filtros e ordenação aplicados no servidor (query_frame); só
+        # a página visível é enviada ao navegador
+        numeric = [field["name"] for field in fields if field["type"] in NUMERIC_TYPES]
+        with st.expander("Filtros e ordenação"):
+            column = st.selectbox("Filtrar coluna numérica", [None] + numeric,
+                                  format_func=lambda x: "Nenhuma" if x is None else x,
+                                  key=f"{data_key}_filtro_coluna")
+            low = high = None
+            if column is not None:
+                col_low, col_high = st.columns(2)
+                low = col_low.number_input("Mínimo", value=None, key=f"{data_key}_filtro_min")
+                high = col_high.number_input("Máximo", value=None, key=f"{data_key}_filtro_max")
+            col_sort, col_order = st.columns(2)
+            # "Mês" só é oferecido nos conjuntos que têm esse campo
+            months_field = ["Mês"] if any(field["name"] == "Mês" for field in fields) else []
+            sort_by = col_sort.selectbox("Ordenar por", ["Data"] + months_field + numeric, key=f"{data_key}_ordem")
+            ascending = col_order.radio("Ordem", ["Crescente", "Decrescente"], horizontal=True,
+                                        key=f"{data_key}_ordem_sentido") == "Crescente"
+
+        view = query_frame(data_key, months, start, end, column, low, high, sort_by, ascending)
+
+        # Paginação (a página é ajustada se os filtros reduzirem o número de páginas)
+        col_size, col_page = st.columns(2)
+        page_size = col_size.selectbox("Linhas por página", TABLE_PAGE_SIZES, key=f"{data_key}_pagina_tamanho")
+        pages = max(1, math.ceil(len(view) / page_size))
+        if st.session_state.get(f"{data_key}_pagina", 1) > pages:
+            st.session_state[f"{data_key}_pagina"] = pages
+        page = col_page.number_input(f"Página (de {pages})", min_value=1, max_value=pages, step=1,
+                                     key=f"{data_key}_pagina")
+        offset = (page - 1) * page_size
+        page_df = view.iloc[offset:offset + page_size]
+
+        # Tabela editável: as edições, inclusões e exclusões ficam no navegador (dentro
+        # do formulário, sem rerun a cada célula) e são gravadas juntas ao salvar
+        message = st.session_state.pop(f"{data_key}_edicao", None)
+        if message:
+            getattr(st, message[0])(message[1])
+        duplicates = count_duplicates(data_key, start)
+        if duplicates:
+            st.warning(f"{duplicates} registros repetem a chave ({' + '.join(NATURAL_KEYS[data_key])}) de outro registro.")
+            if st.button("Remover repetidos (mantém o mais recente)", key=f"{data_key}_deduplicar"):
+                removed = dedup_dataset(data_key)
+                st.session_state[f"{data_key}_edicao"] = ("success", f"{removed} registros repetidos removidos.")
+                st.rerun()
+        ids = list(page_df[ID_COLUMN])
+        editor_key = f"{data_key}_editor_{get_version(data_key)}_{offset}_{hash(tuple(ids))}"
+        with st.form(key=f"{data_key}_editor_form"):
+            st.data_editor(
+                page_df.drop(columns=[ID_COLUMN]).reset_index(drop=True),
+                hide_index=True,
+                num_rows="dynamic",
+                column_config=editor_columns(fields),
+                key=editor_key
+            )
+            st.form_submit_button(
+                "Salvar alterações",
+                on_click=save_table_edits,
+                args=(data_key, editor_key, ids, offset)
+            )
+        st.caption(f"{len(view)} de {len(frame)} registros")
+
+        # Botões para exportar os dados para Excel e CSV (independente do formato de
+        # armazenamento). Os arquivos só são gerados quando o botão é clicado e ficam
+        # em cache até a próxima alteração do conjunto de dados.
+        st.download_button(
+            label="Exportar para Excel",
+            data=lambda: cached_export(data_key, "xlsx", build_excel, title),
+            file_name=f"{title}_dados.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+
+        st.download_button(
+            label="Exportar para CSV",
+            data=lambda: cached_export(data_key, "csv", build_csv),
+            file_name=f"{title}_dados.csv",
+            mime="text/csv"
+        )
+    elif start is not None:
+        st.info("Nenhum dado a partir do início do período selecionado.")
+    else:
+        st.info("Nenhum dado disponível. Preencha o formulário na aba 'Formulário'.")
+
 # Função para exibir tabelas e formulários
-def show_tabs(data_key, fields, title, file_path):
-    abas = st.tabs(["Formulário", "Tabela", "Gráficos"])
+def show_tabs(data_key, fields, title):
+    # Só a aba escolhida é executada: o formulário não paga pela tabela, pelo
+    # Excel e pelos gráficos a cada rerun (a escolha fica salva por rede)
+    aba = st.radio(
+        "Aba",
+        ["Formulário", "Tabela", "Gráficos", "Importar"],
+        horizontal=True,
+        key=f"{data_key}_aba",
+        label_visibility="collapsed"
+    )
+
+    # Os envios deste conjunto ainda na fila de gravação são gravados antes da leitura
+    if aba != "Formulário":
+        flush_writes(data_key, WRITE_FLUSH_TIMEOUT)
 
-    with abas[0]:
+    # Versão exibida nesta execução (lida antes dos dados: uma escrita concorrente só
+    # provoca uma atualização a mais) e acompanhamento de alterações na tabela e nos gráficos
+    st.session_state[f"{data_key}_versao"] = get_version(data_key)
+    if aba in ("Tabela", "Gráficos"):
+        watch_dataset(data_key, aba == "Gráficos")
+
+    if aba == "Formulário":
         st.title(f"Formulário de {title}")
         with st.form(key=f"{data_key}_form"):
             form_data = {}
             for field in fields:
-                if field["type"] == "text":
+                if field["type"] == "text" or field["type"] in NUMERIC_TYPES:
                     form_data[field["name"]] = st.text_input(field["label"])
                 elif field["type"] == "date":
                     form_data[field["name"]] = st.date_input(field["label"])
@@ -708,47 +2814,19 @@ def show_tabs(data_key, fields, title, file_path):
             submit = st.form_submit_button("Enviar")
             if submit:
                 form_data["Data"] = str(form_data.get("Data", ""))
-                st.session_state[data_key].append(form_data)
-                save_data(file_path, st.session_state[data_key])
-                st.success("Dados enviados com sucesso!")
-
-
-    with abas[1]:
-        st.title(f"Tabela de Dados de {title}")
-        if st.session_state[data_key]:
-            df = pd.DataFrame(st.session_state[data_key])
-            st.table(df)
-
-            # Botão para exportar os dados para Excel
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                df.to_excel(writer, index=False, sheet_name=title)
-            buffer.seek(0)
-
-            st.download_button(
-                label="Exportar para Excel",
-                data=buffer,
-                file_name=f"{title}_dados.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+                try:
+                    record = convert_record(form_data, fields, strict=True)
+                except ValueError as error:
+                    st.error(f"Valores inválidos em: {', '.join(error.args[0])}")
+                else:
+                    st.session_state.setdefault("envios", []).append(enqueue_records(data_key, [record]))
+                    st.success("Dados enviados com sucesso! A gravação é concluída em segundo plano.")
 
-            # Seleção de linha para exclusão
-            selected_index = st.selectbox(
-                f"Selecione o registro para apagar da tabela {title}",
-                options=range(len(df)),
-                format_func=lambda x: f"Linha {x + 1}"
-            )
-
-            if st.button(f"Apagar linha selecionada da tabela {title}"):
-                st.session_state[data_key].pop(selected_index)
-                save_data(file_path, st.session_state[data_key])
-                st.success("Registro apagado com sucesso!")
-                st.experimental_rerun()  # Atualiza a interface
-        else:
-            st.info("Nenhum dado disponível. Preencha o formulário na aba 'Formulário'.")
 
+    elif aba == "Tabela":
+        show_table(data_key, fields, title)
 
-    with abas[2]:
+    elif aba == "Gráficos":
         if title == "Instagram":
             show_instagram_graphs()
         if title == "Facebook":
@@ -760,7 +2838,52 @@ def show_tabs(data_key, fields, title, file_path):
         if title == "YouTube Orgânico":
             show_youtube_graphs()
         if title == "Investimento em Mídia":
-            show_investimento_graficos()
+            show_investimento_graficos(data_key)
+
+    elif aba == "Importar":
+        st.title(f"Importação de Dados de {title}")
+        uploaded = st.file_uploader("Arquivo CSV ou XLSX", type=["csv", "xlsx"], key=f"{data_key}_importar")
+        if uploaded is not None:
+            try:
+                columns = read_import_columns(uploaded, uploaded.name)
+            except Exception as error:
+                st.error(f"Não foi possível ler o arquivo: {error}")
+                columns = None
+
+            if columns is not None:
+                # Coluna do arquivo de cada campo, sugerida pelo nome e ajustável
+                st.write("Selecione a coluna do arquivo correspondente a cada campo:")
+                guess = guess_mapping(fields, columns)
+                options = [None] + columns
+                mapping = {}
+                for field in fields:
+                    mapping[field["name"]] = st.selectbox(
+                        field["label"],
+                        options,
+                        index=options.index(guess[field["name"]]),
+                        format_func=lambda x: "(não importar)" if x is None else x,
+                        key=f"{data_key}_importar_{uploaded.file_id}_{field['name']}"
+                    )
+
+                if st.button("Importar", key=f"{data_key}_importar_enviar"):
+                    try:
+                        with st.spinner("Importando..."):
+                            inserted, updated, duplicates, errors, total_errors = import_file(
+                                data_key, uploaded, uploaded.name, mapping
+                            )
+                    except Exception as error:
+                        st.error(f"Erro ao importar o arquivo: {error}")
+                    else:
+                        st.success(f"Importação concluída: {inserted} registros incluídos e {updated} atualizados.")
+                        if duplicates:
+                            key = " + ".join(NATURAL_KEYS[data_key])
+                            st.info(f"{duplicates} linhas repetiam a chave ({key}) de outra linha do arquivo e "
+                                    "foram descartadas; valeu a última.")
+                        if total_errors:
+                            st.warning(f"{total_errors} linhas com erro foram ignoradas.")
+                            if total_errors > len(errors):
+                                st.caption(f"Exibindo as primeiras {len(errors)} linhas com erro.")
+                            st.dataframe(pd.DataFrame(errors), hide_index=True)
 
 
 
@@ -769,249 +2892,92 @@ def show_tabs(data_key, fields, title, file_path):
 if st.session_state.selected_network == "Instagram":
     show_tabs(
         data_key="instagram_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Alcance", "label": "Alcance:", "type": "text"},
-            {"name": "Engajamento", "label": "Engajamento:", "type": "text"},
-            {"name": "Seguidores", "label": "Seguidores:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Instagram",
-        file_path="instagram_data.csv"
+        fields=FIELDS["instagram_data"],
+        title="Instagram"
     )
 
 if st.session_state.selected_network == "Facebook":
     show_tabs(
         data_key="facebook_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Alcance", "label": "Alcance:", "type": "text"},
-            {"name": "Engajamento", "label": "Engajamento:", "type": "text"},
-            {"name": "Seguidores", "label": "Seguidores:", "type": "text"},
-            {"name": "Cliques", "label": "Cliques:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Facebook",
-        file_path="facebook_data.csv"
+        fields=FIELDS["facebook_data"],
+        title="Facebook"
     )
 
 if st.session_state.selected_network == "LinkedIn":
         show_tabs(
             data_key="linkedin_data",
-            fields=[
-                {"name": "Data", "label": "Data:", "type": "date"},
-                {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-                ]},
-                {"name": "Alcance", "label": "Alcance:", "type": "text"},
-                {"name": "Cliques", "label": "Cliques:", "type": "text"},
-                {"name": "Engajamento", "label": "Engajamento:", "type": "text"},
-                {"name": "Seguidores", "label": "Seguidores:", "type": "text"},
-                {"name": "Observação", "label": "Observação:", "type": "text"},
-            ],
-            title="LinkedIn",
-            file_path="linkedin_data.csv"
+            fields=FIELDS["linkedin_data"],
+            title="LinkedIn"
         )
     
 if st.session_state.selected_network == "E-mail MKT":
     show_tabs(
         data_key="email_mkt_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Taxa de Abertura", "label": "Taxa de Abertura:", "type": "text"},
-            {"name": "Cliques", "label": "Cliques:", "type": "text"},
-            {"name": "Descadastro", "label": "Descadastro:", "type": "text"},
-            {"name": "Receita Gerada", "label": "Receita Gerada:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="E-mail MKT",
-        file_path="email_mkt_data.csv"
+        fields=FIELDS["email_mkt_data"],
+        title="E-mail MKT"
     )
 
 if st.session_state.selected_network == "YouTube Orgânico":
     show_tabs(
         data_key="youtube_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Visualizações", "label": "Visualizações:", "type": "text"},
-            {"name": "Duração Média da Visualização", "label": "Duração Média da Visualização:", "type": "text"},
-            {"name": "Inscritos", "label": "Inscritos:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="YouTube Orgânico",
-        file_path="youtube_data.csv"
+        fields=FIELDS["youtube_data"],
+        title="YouTube Orgânico"
     )
 
 if st.session_state.selected_network == "Investimento em Mídia":
     show_tabs(
         data_key="midia_investimento_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Google(Display)", "label": "Google (Display):", "type": "text"},
-            {"name": "Google(Search)", "label": "Google (Search):", "type": "text"},
-            {"name": "Google(Youtube)", "label": "Google (YouTube):", "type": "text"},
-            {"name": "Meta Ads", "label": "Meta Ads:", "type": "text"},
-            {"name": "LinkedIn ADS", "label": "LinkedIn ADS:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Investimento em Mídia",
-        file_path="midia_investimento_data.csv"
+        fields=FIELDS["midia_investimento_data"],
+        title="Investimento em Mídia"
     )
 
 if st.session_state.selected_network == "Custos":
     show_tabs(
         data_key="custos_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Beicast Aluguel espaço", "label": "Beicast Aluguel espaço:", "type": "text"},
-            {"name": "Shopify", "label": "Shopify:", "type": "text"},
-            {"name": "Custo Ramper MKT", "label": "Custo Ramper MKT:", "type": "text"},
-            {"name": "Alex Gestor de tráfego", "label": "Alex Gestor de tráfego:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Custos",
-        file_path="custos_data.csv"
+        fields=FIELDS["custos_data"],
+        title="Custos"
     )
 
 if st.session_state.selected_network == "Site Beirama":
     show_tabs(
         data_key="site_beirama_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Sessões", "label": "Sessões:", "type": "text"},
-            {"name": "Taxa de Rejeição (%)", "label": "Taxa de Rejeição (%):", "type": "text"},
-            {"name": "Duração Média da Sessão", "label": "Duração Média da Sessão (min):", "type": "text"},
-            {"name": "Taxa de Conversão (%)", "label": "Taxa de Conversão (%):", "type": "text"},
-            {"name": "Páginas Mais Acessadas", "label": "Páginas Mais Acessadas:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Site Beirama",
-        file_path="site_beirama_data.csv"
+        fields=FIELDS["site_beirama_data"],
+        title="Site Beirama"
     )
 
 if st.session_state.selected_network == "Resultados Google":
 
     show_tabs(
         data_key="resultados_google_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Cliques (Search)", "label": "Cliques (Google Search):", "type": "text"},
-            {"name": "Cliques (Display)", "label": "Cliques (Google Display):", "type": "text"},
-            {"name": "Contatos", "label": "Contatos (Cadastros/Conversões):", "type": "text"},
-            {"name": "Negócios/Propostas", "label": "Negócios/Propostas (Volume):", "type": "text"},
-            {"name": "Fechamento", "label": "Fechamento:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Resultados Google",
-        file_path="resultados_google_data.csv"
+        fields=FIELDS["resultados_google_data"],
+        title="Resultados Google"
     )
 
 if st.session_state.selected_network == "Resultados Meta BEIRAMA":
 
     show_tabs(
         data_key="resultados_meta_beirama_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Cliques (Search)", "label": "Cliques (Google Search):", "type": "text"},
-            {"name": "Cliques (Display)", "label": "Cliques (Google Display):", "type": "text"},
-            {"name": "Contatos", "label": "Contatos (Cadastros/Conversões):", "type": "text"},
-            {"name": "Negócios/Propostas", "label": "Negócios/Propostas (Volume):", "type": "text"},
-            {"name": "Fechamento", "label": "Fechamento:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Resultados Meta BEIRAMA",
-        file_path="resultados_meta_beirama_data.csv"
+        fields=FIELDS["resultados_meta_beirama_data"],
+        title="Resultados Meta BEIRAMA"
     )
 
 if st.session_state.selected_network == "Performance":
     show_tabs(
         data_key="performance_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Margem de Contribuição", "label": "Margem de Contribuição (%):", "type": "text"},
-            {"name": "Ticket Médio", "label": "Ticket Médio (R$):", "type": "text"},
-            {"name": "ROI", "label": "ROI (%):", "type": "text"},
-            {"name": "ROAS", "label": "ROAS:", "type": "text"},
-            {"name": "CPV", "label": "CPV (R$):", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Performance",
-        file_path="performance_data.csv"
+        fields=FIELDS["performance_data"],
+        title="Performance"
     )
 
 if st.session_state.selected_network == "Site Beirama (Semanal)":
     show_tabs(
         data_key="site_beirama_semanal_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Sessões", "label": "Sessões:", "type": "text"},
-            {"name": "Taxa de Rejeição", "label": "Taxa de Rejeição (%):", "type": "text"},
-            {"name": "Duração Média da Sessão", "label": "Duração Média da Sessão (min):", "type": "text"},
-            {"name": "Taxa de Conversão", "label": "Taxa de Conversão (%):", "type": "text"},
-            {"name": "Páginas mais Acessadas", "label": "Páginas mais Acessadas:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Site Beirama (Semanal)",
-        file_path="site_beirama_semanal_data.csv"
+        fields=FIELDS["site_beirama_semanal_data"],
+        title="Site Beirama (Semanal)"
     )
 
 if st.session_state.selected_network == "Investimento em Mídia (Semanal)":
     show_tabs(
         data_key="midia_investimento_semanal_data",
-        fields=[
-            {"name": "Data", "label": "Data:", "type": "date"},
-            {"name": "Mês", "label": "Mês:", "type": "select", "options": [
-                "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-                "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-            ]},
-            {"name": "Google(Display)", "label": "Google (Display):", "type": "text"},
-            {"name": "Google(Search)", "label": "Google (Search):", "type": "text"},
-            {"name": "Google(Youtube)", "label": "Google (YouTube):", "type": "text"},
-            {"name": "Meta Ads", "label": "Meta Ads:", "type": "text"},
-            {"name": "LinkedIn ADS", "label": "LinkedIn ADS:", "type": "text"},
-            {"name": "Observação", "label": "Observação:", "type": "text"},
-        ],
-        title="Investimento em Mídia",
-        file_path="midia_investimento_semanal_data.csv"
+        fields=FIELDS["midia_investimento_semanal_data"],
+        title="Investimento em Mídia"
     )
\ No newline at end of file